@@ -0,0 +1,337 @@
+import asyncio
+import sys
+import time
+
+import aiohttp
+
+from request_metrics import RequestMetrics
+from vultr_common import (
+    API_BASE_URL,
+    CATALOG_ITEM_PARSERS,
+    CATALOG_PARSERS,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_TIMEOUTS,
+    MAX_PLAN_COST,
+    MAX_RETRIES,
+    ApiResponse,
+    auth_headers,
+    compact_items,
+    compact_plan,
+    conditional_headers,
+    default_pool_size,
+    flight_key,
+    filter_affordable_plans,
+    instance_payload,
+    make_rate_limiter,
+    operation_kind,
+    parse_availability,
+    parse_instance,
+    parse_no_content,
+    parse_page,
+    parse_reinstall,
+    reinstall_payload,
+    request_error,
+    response_validators,
+    retry_delay,
+    should_retry,
+    sort_regions,
+)
+
+class AsyncVultrAPI:
+    """asyncio counterpart of VultrAPI with the same method surface.
+
+    Use as ``async with AsyncVultrAPI(key) as api:`` or call ``close()``
+    when done, so the underlying aiohttp session is released.
+    """
+
+    def __init__(self, api_key, max_workers=DEFAULT_CONCURRENCY, page_size=DEFAULT_PAGE_SIZE,
+                 rate_limit=DEFAULT_RATE_LIMIT, max_retries=MAX_RETRIES, recorder=None, transport=None,
+                 timeouts=None, pool_size=None, compress=True):
+        self.api_key = api_key
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.rate_limiter = make_rate_limiter(rate_limit)
+        self.max_retries = max_retries
+        self.last_error = None
+        self.metrics = RequestMetrics()
+        # Optional vultr_traffic hooks; a ReplayTransport stands in for aiohttp entirely.
+        self.recorder = recorder
+        self.transport = transport
+        # Identical concurrent GETs share one in-flight task.
+        self._in_flight = {}
+        self.base_url = API_BASE_URL
+        self.headers = auth_headers(api_key, compress)
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.pool_size = pool_size or default_pool_size(max_workers)
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        # The session binds to the running loop, so it is created on first use.
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size)
+            )
+        return self.session
+
+    def _timeout(self, method, kwargs):
+        connect, read = self.timeouts[operation_kind(method, kwargs)]
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    async def warm_up(self):
+        """Open a pooled connection to the API host ahead of the first call; see VultrAPI.warm_up."""
+        if self.transport:
+            return False
+        try:
+            async with self._get_session().head(self.base_url, timeout=self._timeout("GET", {})):
+                return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Warm-up failed: {e}", file=sys.stderr)
+            return False
+
+    async def _throttle(self):
+        if self.rate_limiter:
+            delay = self.rate_limiter.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _send_once(self, method, url, **kwargs):
+        if self.transport:
+            response, elapsed = self.transport.lookup(method, url, kwargs.get("params"))
+            delay = self.transport.delay(elapsed)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+        async with self._get_session().request(method, url, timeout=self._timeout(method, kwargs), **kwargs) as raw:
+            # A CIMultiDict copy: lookups like "Retry-After" and "ETag" stay case-insensitive.
+            return ApiResponse(raw.status, raw.headers.copy(), await raw.read())
+
+    async def _request(self, method, path, **kwargs):
+        if method != "GET":
+            return await self._send(method, path, **kwargs)
+        key = flight_key(method, path, kwargs)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, path, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.metrics.record_coalesced(method, path)
+        # Shielded so one caller's cancellation does not fail the others.
+        return await asyncio.shield(task)
+
+    async def _send(self, method, path, **kwargs):
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            await self._throttle()
+            url = f"{self.base_url}{path}"
+            sent = time.monotonic()
+            try:
+                response = await self._send_once(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Request failed: {e}", file=sys.stderr)
+                self.last_error = request_error(None, str(e))
+                self.metrics.record(method, path, None, time.monotonic() - started, attempt)
+                return None
+            if self.recorder:
+                self.recorder.record(
+                    method, url, kwargs.get("params"), kwargs.get("json"), response, time.monotonic() - sent
+                )
+
+            if should_retry(method, response.status_code, attempt, self.max_retries):
+                await asyncio.sleep(retry_delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                self.last_error = request_error(response.status_code, f"{method} {path} -> {response.status_code}")
+            self.metrics.record(
+                method, path, response.status_code, time.monotonic() - started, attempt, len(response.content)
+            )
+            return response
+
+    async def _iter_pages(self, path, key, per_page=None, cursor=None, errors=None):
+        """Yield each page of a list endpoint, following meta.links.next cursors.
+
+        A failed page ends the iteration; if errors is a list, the failure is
+        appended to it, so callers can tell a partial list from a complete one.
+        """
+        params = {"per_page": per_page or self.page_size}
+        if cursor:
+            params["cursor"] = cursor
+        while True:
+            response = await self._request("GET", path, params=params)
+            page = parse_page(response, key)
+            if page is None:
+                if errors is not None:
+                    status = response.status_code if response else None
+                    errors.append(request_error(status, f"GET {path} -> {status}"))
+                return
+
+            items, cursor = page
+            yield items
+
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    async def _iter_items(self, path, key, per_page=None, cursor=None, parse_item=None, errors=None):
+        async for page in self._iter_pages(path, key, per_page, cursor, errors):
+            for item in compact_items(page, parse_item):
+                yield item
+
+    async def _collect(self, path, key, per_page=None, cursor=None, parse_item=None, errors=None):
+        return [item async for item in self._iter_items(path, key, per_page, cursor, parse_item, errors)]
+
+    def iter_instance_pages(self, per_page=None, errors=None):
+        """Yield server instances one page at a time; see _iter_pages for errors."""
+        return self._iter_pages("/instances", "instances", per_page, errors=errors)
+
+    def iter_instances(self, per_page=None):
+        """Yield server instances across all pages."""
+        return self._iter_items("/instances", "instances", per_page)
+
+    def iter_plans(self, per_page=None):
+        """Yield plans across all pages."""
+        return self._iter_items("/plans", "plans", per_page)
+
+    def iter_os(self, per_page=None):
+        """Yield OS images across all pages."""
+        return self._iter_items("/os", "os", per_page)
+
+    def iter_regions(self, per_page=None):
+        """Yield regions across all pages."""
+        return self._iter_items("/regions", "regions", per_page)
+
+    async def get_plans(self, max_cost=MAX_PLAN_COST):
+        """Fetch plans costing at most max_cost USD per month, cheapest first."""
+        return filter_affordable_plans(await self._collect("/plans", "plans", parse_item=compact_plan), max_cost)
+
+    async def get_os_list(self):
+        """Fetch OS images."""
+        return await self._collect("/os", "os")
+
+    async def create_instance(self, region, plan, os_id):
+        """Create a server instance."""
+        response = await self._request("POST", "/instances", json=instance_payload(region, plan, os_id))
+        return parse_instance(response, expected_status=202)
+
+    async def get_instances(self):
+        """Fetch all server instances."""
+        return await self._collect("/instances", "instances")
+
+    async def get_instance_detail(self, instance_id):
+        """Fetch detailed instance info (including password)."""
+        return parse_instance(await self._request("GET", f"/instances/{instance_id}"))
+
+    async def _map_concurrently(self, func, items, max_workers=None):
+        """Run coroutine func(item) under a semaphore, yielding (item, result) as each completes."""
+        items = list(items)
+        if not items:
+            return
+
+        semaphore = asyncio.Semaphore(max(1, max_workers or self.max_workers))
+
+        async def run(item):
+            async with semaphore:
+                return item, await func(item)
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_instance_details(self, instance_ids, max_workers=None):
+        """Fetch instance details concurrently, yielding (id, detail) as each completes."""
+        instance_ids = [instance_id for instance_id in instance_ids if instance_id]
+        return self._map_concurrently(self.get_instance_detail, instance_ids, max_workers)
+
+    def create_instances(self, specs, max_workers=None):
+        """Create instances concurrently from (region, plan, os_id) specs; see VultrAPI.create_instances."""
+        specs = list(specs)
+
+        async def create(index):
+            return await self.create_instance(*specs[index])
+
+        return self._map_concurrently(create, range(len(specs)), max_workers)
+
+    async def reinstall_instance(self, instance_id, os_id=None):
+        """Reinstall OS for the instance."""
+        payload = reinstall_payload(os_id)
+        if payload:
+            response = await self._request("POST", f"/instances/{instance_id}/reinstall", json=payload)
+        else:
+            response = await self._request("POST", f"/instances/{instance_id}/reinstall")
+        return parse_reinstall(response)
+
+    async def delete_instance(self, instance_id):
+        """Delete a server instance."""
+        return parse_no_content(await self._request("DELETE", f"/instances/{instance_id}"))
+
+    def reinstall_instances(self, instance_ids, os_id=None, max_workers=None):
+        """Reinstall instances concurrently; see VultrAPI.reinstall_instances."""
+        async def reinstall(instance_id):
+            return await self.reinstall_instance(instance_id, os_id)
+
+        return self._map_concurrently(reinstall, instance_ids, max_workers)
+
+    def delete_instances(self, instance_ids, max_workers=None):
+        """Delete instances concurrently; see VultrAPI.delete_instances."""
+        return self._map_concurrently(self.delete_instance, instance_ids, max_workers)
+
+    async def get_regions(self):
+        """Fetch available regions."""
+        return sort_regions(await self._collect("/regions", "regions"))
+
+    async def get_region_availability(self, region_id):
+        """Fetch the plan ids deployable in a region; None on failure."""
+        return parse_availability(await self._request("GET", f"/regions/{region_id}/availability"))
+
+    def get_regions_availability(self, region_ids, max_workers=None):
+        """Fetch availability for many regions concurrently; see VultrAPI.get_regions_availability."""
+        return self._map_concurrently(self.get_region_availability, region_ids, max_workers)
+
+    async def fetch_catalog(self, resource, validators=None):
+        """Conditionally fetch a catalog; see VultrAPI.fetch_catalog."""
+        validators = validators or {}
+        path = f"/{resource}"
+        response = await self._request(
+            "GET",
+            path,
+            params={"per_page": self.page_size},
+            headers=conditional_headers(validators)
+        )
+        if response is not None and response.status_code == 304:
+            return None, validators
+
+        page = parse_page(response, resource)
+        if page is None:
+            return None
+
+        # Each page is trimmed to the fields the panel uses as it arrives.
+        parse_item = CATALOG_ITEM_PARSERS.get(resource)
+        items, cursor = page
+        items = compact_items(items, parse_item)
+        if cursor:
+            errors = []
+            items.extend(await self._collect(path, resource, cursor=cursor, parse_item=parse_item, errors=errors))
+            if errors:
+                return None
+        return CATALOG_PARSERS[resource](items), response_validators(response)
@@ -0,0 +1,92 @@
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised by CancelToken.check() inside a task that was cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag handed to each background task."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds; returns True early if cancelled."""
+        return self._event.wait(timeout)
+
+
+class TaskRunner:
+    """Runs UI work on background threads with cancellation tokens.
+
+    Each task gets a CancelToken as its first argument. Starting a named
+    task cancels the running task of the same name (a new refresh
+    supersedes the stale one); unnamed tasks only stop on cancel_all().
+    """
+
+    def __init__(self, run_thread):
+        self.run_thread = run_thread
+        self.closed = False
+        self._lock = threading.Lock()
+        self._named = {}
+        self._tokens = set()
+
+    def _begin(self, name):
+        token = CancelToken()
+        with self._lock:
+            if self.closed:
+                token.cancel()
+                return token
+            previous = self._named.get(name) if name else None
+            if name:
+                self._named[name] = token
+            self._tokens.add(token)
+        if previous:
+            previous.cancel()
+        return token
+
+    def _finish(self, name, token):
+        with self._lock:
+            self._tokens.discard(token)
+            if name and self._named.get(name) is token:
+                del self._named[name]
+
+    def run(self, name, func, *args):
+        """Run func(token, *args) on the calling thread as task name."""
+        token = self._begin(name)
+        try:
+            if not token.cancelled:
+                return func(token, *args)
+        except TaskCancelled:
+            pass
+        finally:
+            self._finish(name, token)
+
+    def start(self, name, func, *args):
+        """Run func(token, *args) on a background thread as task name."""
+        self.run_thread(self.run, name, func, *args)
+
+    def cancel(self, name):
+        with self._lock:
+            token = self._named.get(name)
+        if token:
+            token.cancel()
+
+    def cancel_all(self):
+        """Cancel every running task and refuse new ones."""
+        with self._lock:
+            self.closed = True
+            tokens = list(self._tokens)
+        for token in tokens:
+            token.cancel()
@@ -0,0 +1,275 @@
+"""Scaling benchmarks for the panel's Vultr API call patterns.
+
+Runs the real VultrManager handlers (refresh_servers, query_all, bulk
+create and bulk delete) against benchmarks/mock_vultr.py. The mock runs
+in a subprocess, so its allocations stay out of the measurements. For each
+scenario x profile x fleet size the suite reports:
+
+* wall     - seconds for the handler to return (background work included)
+* requests - API requests the mock served, and how many were not 2xx
+* conns    - connections the mock accepted, and KiB of response bodies sent
+* peak     - peak Python heap allocated by the client (tracemalloc, in a
+             separate pass so tracing does not skew the timings)
+
+    python benchmarks/bench_api.py --sizes 10,100,1000 --profiles baseline,latency
+    python benchmarks/bench_api.py --sizes 10000 --scenarios refresh --json
+
+The wan profile adds connection setup and limited bandwidth; run it with
+--clients tuned,untuned to compare the client's transport settings (pool
+sized to the fan-out and a warm-up connection) with requests' stock ones.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from vultr_common import default_pool_size, make_rate_limiter
+
+PROFILES = {
+    "baseline": {},
+    "latency": {"latency": 0.02, "latency_jitter": 0.01},
+    "errors": {"latency": 0.005, "error_rate": 0.05, "error_status": 503},
+    # Below the client's default of 20 requests/second, so the mock answers 429s.
+    "throttle": {"latency": 0.005, "throttle_rps": 10},
+    "wan": {"latency": 0.03, "latency_jitter": 0.01, "connect_latency": 0.15, "bandwidth": 1_000_000},
+}
+# Client transport settings. "tuned" warms a connection up before the timed
+# call, as the panel does while its window is being built. "untuned" is a
+# stock requests session: a pool of 10 and requests' own Accept-Encoding
+# (gzip, deflate), so both clients receive compressed responses.
+CLIENTS = {
+    "tuned": {"warm_up": True},
+    "untuned": {"warm_up": False, "pool_size": 10, "stock_headers": True},
+}
+SCENARIOS = ("refresh", "query_all", "bulk_create", "bulk_delete")
+BULK_SIZE = 50
+
+
+class MockServer:
+    """Runs mock_vultr.py in a subprocess and talks to its control endpoints."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "mock_vultr.py"), "--port", "0"],
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        self.url = self.process.stdout.readline().strip().rsplit(" ", 1)[-1]
+
+    def control(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(f"{self.url}{path}", data=data, method="POST" if data else "GET")
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+        return json.loads(body) if body else None
+
+    def reset(self, settings):
+        self.control("/_reset", settings)
+
+    def stats(self):
+        return self.control("/_stats")
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+class BenchPage:
+    """Page stand-in; background threads run inline so their requests are counted."""
+
+    def __init__(self):
+        self.window = types.SimpleNamespace()
+        self.overlay = []
+
+    def add(self, *controls):
+        pass
+
+    def update(self, *controls):
+        pass
+
+    def run_thread(self, handler, *args, **kwargs):
+        handler(*args, **kwargs)
+
+    def set_clipboard(self, text):
+        pass
+
+
+def make_manager(base_url, rate_limit, client="tuned", concurrency=None):
+    import flet as ft
+    from main import VultrManager
+
+    # The list is never mounted, so scrolling back to the top is a no-op.
+    ft.ListView.scroll_to = lambda self, **kwargs: None
+
+    class BenchManager(VultrManager):
+        def create_api(self, api_key):
+            api = super().create_api(api_key)
+            api.base_url = f"{base_url}/v2"
+            if rate_limit is not None:
+                api.rate_limiter = make_rate_limiter(rate_limit)
+            if concurrency:
+                api.max_workers = concurrency
+                api.pool_size = default_pool_size(concurrency)
+            # Read when the session is created, on the first request.
+            settings = CLIENTS[client]
+            api.pool_size = settings.get("pool_size", api.pool_size)
+            if settings.get("stock_headers"):
+                # Leave Accept-Encoding to the session's defaults.
+                api.headers = {k: v for k, v in api.headers.items() if k != "Accept-Encoding"}
+            return api
+
+    manager = BenchManager(BenchPage())
+    manager.api = manager.create_api("benchmark-key")
+    # One account, whatever the local config holds.
+    manager.apis = {"benchmark": manager.api}
+    manager.active_account = "benchmark"
+    manager.pending_accounts = None
+    manager.catalog_cache.set_api_key("benchmark-key")
+    return manager
+
+
+def run_refresh(manager, fleet):
+    manager.refresh_servers(None)
+
+
+def run_query_all(manager, fleet):
+    manager.query_all(None, force=True)
+
+
+def run_bulk_create(manager, fleet):
+    manager.bulk_create([("ewr", "vc2-1c-1gb", 2136)] * BULK_SIZE)
+
+
+def run_bulk_delete(manager, fleet):
+    manager.set_selection(inst.id for inst in manager.total_servers[:BULK_SIZE])
+    manager.bulk_delete(None)
+    # Press the confirmation dialog's delete button.
+    manager.page.overlay[-1].actions[1].on_click(None)
+
+
+RUNNERS = {
+    "refresh": run_refresh,
+    "query_all": run_query_all,
+    "bulk_create": run_bulk_create,
+    "bulk_delete": run_bulk_delete,
+}
+
+
+def run_once(server, scenario, profile, fleet, rate_limit, trace_memory, client="tuned", concurrency=None):
+    """Run one scenario on a fresh manager; returns (wall seconds, peak bytes or None)."""
+    settings = dict(PROFILES[profile], fleet=fleet)
+    manager = make_manager(server.url, rate_limit, client, concurrency)
+    if scenario == "bulk_delete":
+        # Load the ids to delete without faults; the fleet is deterministic,
+        # so the reset below rebuilds the same instances.
+        server.reset({"fleet": fleet})
+        manager.refresh_servers(None)
+    server.reset(settings)
+    if CLIENTS[client]["warm_up"]:
+        manager.api.warm_up()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    RUNNERS[scenario](manager, fleet)
+    wall = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    manager.poller.clear()
+    return wall, peak
+
+
+def run_scenario(server, scenario, profile, fleet, rate_limit=None, measure_memory=True,
+                 client="tuned", concurrency=None):
+    # tracemalloc slows the client several-fold, so wall time and request
+    # counts come from an untraced pass and peak memory from a second one.
+    wall, _ = run_once(server, scenario, profile, fleet, rate_limit, False, client, concurrency)
+    stats = server.stats()
+    peak = None
+    if measure_memory:
+        _, peak = run_once(server, scenario, profile, fleet, rate_limit, True, client, concurrency)
+
+    errors = sum(count for status, count in stats["by_status"].items() if not status.startswith("2"))
+    return {
+        "scenario": scenario,
+        "profile": profile,
+        "client": client,
+        "fleet": fleet,
+        "wall_s": round(wall, 3),
+        "requests": stats["requests"],
+        "non_2xx": errors,
+        "connections": stats["connections"],
+        "response_kib": round(stats["response_bytes"] / 1024, 1),
+        "peak_mib": None if peak is None else round(peak / (1024 * 1024), 2)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="comma-separated fleet sizes (e.g. 10,100,1000,10000)")
+    parser.add_argument("--profiles", default="baseline,latency,errors,throttle",
+                        help=f"comma-separated subset of {','.join(PROFILES)}")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--clients", default="tuned",
+                        help=f"comma-separated subset of {','.join(CLIENTS)}")
+    parser.add_argument("--concurrency", type=int,
+                        help="client fan-out width (default: the client's own)")
+    parser.add_argument("--rate-limit", type=float,
+                        help="client requests/second (default: the client's own; 0 disables)")
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="skip the tracemalloc pass (halves the run time)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    profiles = args.profiles.split(",")
+    scenarios = args.scenarios.split(",")
+    clients = args.clients.split(",")
+
+    server = MockServer()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            for scenario in scenarios:
+                for profile in profiles:
+                    for fleet in sizes:
+                        for client in clients:
+                            result = run_scenario(
+                                server, scenario, profile, fleet, args.rate_limit, not args.skip_memory,
+                                client, args.concurrency
+                            )
+                            results.append(result)
+                            if not args.json:
+                                print(
+                                    f"{result['scenario']:<12}{result['profile']:<10}{result['client']:<9}"
+                                    f"{result['fleet']:>7}{result['wall_s']:>10.3f}s{result['requests']:>8} req"
+                                    f"{result['non_2xx']:>6} err{result['connections']:>6} conn"
+                                    f"{result['response_kib']:>10.1f} KiB"
+                                    + ("" if result["peak_mib"] is None else f"{result['peak_mib']:>9.2f} MiB"),
+                                    flush=True
+                                )
+            os.chdir(REPO_ROOT)
+    finally:
+        server.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
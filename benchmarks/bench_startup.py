@@ -0,0 +1,106 @@
+"""Startup-time benchmark for the Flet panel.
+
+Each run starts a fresh interpreter and reports:
+
+* import  - time to ``import main`` (and whether requests was pulled in)
+* first   - time from before the import until the first frame is sent
+            (the first ``page.add``/``page.update``)
+* ready   - time until ``VultrManager.__init__`` returns
+
+The page is a recording stand-in, so no window or network is involved.
+A saved API key is written to a temporary config.json to exercise the
+key-loading path.
+
+    python benchmarks/bench_startup.py --runs 10 [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time, types
+start = time.perf_counter()
+sys.path.insert(0, REPO_ROOT)
+import main
+imported = time.perf_counter()
+requests_loaded = "requests" in sys.modules
+
+class RecordingPage:
+    def __init__(self):
+        self.window = types.SimpleNamespace()
+        self.overlay = []
+        self.first_frame = None
+    def _frame(self):
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter()
+    def add(self, *controls):
+        self._frame()
+    def update(self, *controls):
+        self._frame()
+    def run_thread(self, handler, *args, **kwargs):
+        pass
+
+page = RecordingPage()
+main.VultrManager(page)
+ready = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first": page.first_frame - start,
+    "ready": ready - start,
+    "requests_at_import": requests_loaded
+}))
+"""
+
+
+def run_probe(workdir):
+    code = PROBE.replace("REPO_ROOT", repr(REPO_ROOT))
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "config.json"), "w", encoding="utf-8") as f:
+            json.dump({"api_key": "benchmark-key"}, f)
+        # Warm the OS file cache and bytecode so runs measure steady-state startup.
+        run_probe(workdir)
+        runs = [run_probe(workdir) for _ in range(args.runs)]
+
+    summary = {
+        metric: {
+            "median_ms": statistics.median(run[metric] for run in runs) * 1000,
+            "min_ms": min(run[metric] for run in runs) * 1000
+        }
+        for metric in ("import", "first", "ready")
+    }
+    summary["requests_at_import"] = runs[-1]["requests_at_import"]
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{'metric':<8}{'median ms':>12}{'min ms':>10}")
+    for metric in ("import", "first", "ready"):
+        print(f"{metric:<8}{summary[metric]['median_ms']:>12.1f}{summary[metric]['min_ms']:>10.1f}")
+    print(f"requests imported by 'import main': {summary['requests_at_import']}")
+
+
+if __name__ == "__main__":
+    main()
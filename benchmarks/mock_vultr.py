@@ -0,0 +1,369 @@
+"""Local stand-in for the Vultr v2 endpoints the panel uses.
+
+Serves /v2/instances (cursor paginated), /v2/instances/{id},
+instance create/reinstall/delete, /v2/regions, /v2/plans, /v2/os and
+/v2/regions/{id}/availability from a synthetic fleet. Latency, error
+rate and 429 throttling are configurable per scenario, as are the costs a
+real WAN link adds: connection setup (standing in for DNS + TCP + TLS),
+bandwidth, and gzip for clients that accept it.
+
+Control endpoints (not part of the Vultr API):
+
+* ``POST /_reset`` with a JSON body of settings (see DEFAULT_SETTINGS)
+  rebuilds the fleet and clears counters.
+* ``GET /_stats`` returns request counts by endpoint and status, plus the
+  connections that served API requests and response bytes sent.
+
+    python benchmarks/mock_vultr.py --port 8080 --fleet 1000 --latency 0.02
+"""
+import argparse
+import gzip
+import json
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_SETTINGS = {
+    "fleet": 100,
+    # Seconds added to every API response, plus up to latency_jitter more.
+    "latency": 0.0,
+    "latency_jitter": 0.0,
+    # Fraction of API requests answered with error_status.
+    "error_rate": 0.0,
+    "error_status": 503,
+    # Requests per second before answering 429; 0 disables throttling.
+    "throttle_rps": 0,
+    # Retry-After header sent with 429s; None sends no header.
+    "retry_after": None,
+    "max_per_page": 500,
+    # Seconds before a new connection is served (the handshake of a fresh TLS connection).
+    "connect_latency": 0.0,
+    # Response body bytes per second; 0 is unlimited.
+    "bandwidth": 0,
+    # Gzip bodies for requests sending Accept-Encoding: gzip, as the real API does.
+    "gzip": True,
+}
+
+REGIONS = ["ewr", "ord", "dfw", "sea", "lax", "atl", "ams", "lhr", "fra", "sjc", "syd", "nrt", "sgp"]
+PLANS = [
+    ("vc2-1c-0.5gb", 2.5, 1, 512),
+    ("vc2-1c-1gb", 5.0, 1, 1024),
+    ("vc2-1c-2gb", 10.0, 1, 2048),
+    ("vc2-2c-4gb", 20.0, 2, 4096),
+    ("vhf-1c-1gb", 6.0, 1, 1024),
+    ("vhp-1c-1gb-amd", 6.0, 1, 1024),
+]
+OS_IMAGES = [(2136, "Debian 12 x64 (bookworm)"), (1743, "Ubuntu 22.04 LTS x64"),
+             (2284, "Ubuntu 24.04 LTS x64"), (542, "CentOS 9 Stream x64"),
+             (2514, "Windows 2022 Standard x64")]
+
+
+def make_instance(index):
+    region = REGIONS[index % len(REGIONS)]
+    plan = PLANS[index % 2]
+    os_id, os_name = OS_IMAGES[index % len(OS_IMAGES)]
+    return {
+        "id": f"{index:08x}-0000-4000-8000-{index:012x}",
+        "os": os_name,
+        "os_id": os_id,
+        "ram": plan[3],
+        "disk": 10,
+        "main_ip": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+        "vcpu_count": plan[2],
+        "region": region,
+        "plan": plan[0],
+        "date_created": "2024-01-01T00:00:00+00:00",
+        "status": "active",
+        "power_status": "running",
+        "server_status": "ok",
+        "label": f"node-{index}",
+        "hostname": f"node-{index}",
+        "tag": "",
+        "tags": [],
+        "default_password": f"pw-{index:06d}!",
+    }
+
+
+class MockState:
+    def __init__(self, settings=None):
+        self.lock = threading.Lock()
+        self.reset(settings or {})
+
+    def reset(self, settings):
+        with self.lock:
+            self.settings = dict(DEFAULT_SETTINGS, **settings)
+            self.instances = {}
+            self.order = []
+            for index in range(self.settings["fleet"]):
+                instance = make_instance(index)
+                self.instances[instance["id"]] = instance
+                self.order.append(instance["id"])
+            self.next_index = self.settings["fleet"]
+            self.stats = {"requests": 0, "connections": 0, "response_bytes": 0, "by_endpoint": {}, "by_status": {}}
+            self.tokens = float(self.settings["throttle_rps"] or 0)
+            self.updated = time.monotonic()
+            self.random = random.Random(1234)
+
+    def record(self, endpoint, status):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["by_endpoint"][endpoint] = self.stats["by_endpoint"].get(endpoint, 0) + 1
+            self.stats["by_status"][str(status)] = self.stats["by_status"].get(str(status), 0) + 1
+
+    def count_response(self, size, new_connection):
+        with self.lock:
+            self.stats["response_bytes"] += size
+            self.stats["connections"] += new_connection
+
+    def throttled(self):
+        rate = self.settings["throttle_rps"]
+        if not rate:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(rate, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            if self.tokens < 1:
+                return True
+            self.tokens -= 1
+            return False
+
+    def failed(self):
+        with self.lock:
+            return self.random.random() < self.settings["error_rate"]
+
+
+ROUTES = [
+    ("GET", re.compile(r"^/v2/instances$"), "list_instances", "/instances"),
+    ("POST", re.compile(r"^/v2/instances$"), "create_instance", "/instances"),
+    ("GET", re.compile(r"^/v2/instances/([^/]+)$"), "get_instance", "/instances/{id}"),
+    ("DELETE", re.compile(r"^/v2/instances/([^/]+)$"), "delete_instance", "/instances/{id}"),
+    ("POST", re.compile(r"^/v2/instances/([^/]+)/reinstall$"), "reinstall_instance", "/instances/{id}/reinstall"),
+    ("GET", re.compile(r"^/v2/regions$"), "list_regions", "/regions"),
+    ("GET", re.compile(r"^/v2/regions/([^/]+)/availability$"), "region_availability", "/regions/{id}/availability"),
+    ("GET", re.compile(r"^/v2/plans$"), "list_plans", "/plans"),
+    ("GET", re.compile(r"^/v2/os$"), "list_os", "/os"),
+]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.state.settings["connect_latency"]:
+            time.sleep(self.state.settings["connect_latency"])
+        self.counted = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        settings = self.state.settings
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        if body and settings["gzip"] and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        if not self.path.startswith("/_"):
+            self.state.count_response(len(body), new_connection=not self.counted)
+            self.counted = True
+        if settings["bandwidth"]:
+            time.sleep(len(body) / settings["bandwidth"])
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        # Clients warm up connections with a HEAD of the base URL; it opens a
+        # connection but is not an API request, so it is not in the counts.
+        self.send_json(404)
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        if url.path == "/_stats":
+            with self.state.lock:
+                return self.send_json(200, self.state.stats)
+        if url.path == "/_reset":
+            self.state.reset(self.read_json())
+            return self.send_json(204)
+
+        for route_method, pattern, handler_name, endpoint in ROUTES:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                break
+        else:
+            self.read_json()
+            self.state.record("unknown", 404)
+            return self.send_json(404, {"error": "Not found"})
+
+        body = self.read_json()
+        settings = self.state.settings
+        if settings["latency"] or settings["latency_jitter"]:
+            time.sleep(settings["latency"] + random.random() * settings["latency_jitter"])
+
+        if self.state.throttled():
+            headers = {}
+            if settings["retry_after"] is not None:
+                headers["Retry-After"] = str(settings["retry_after"])
+            self.state.record(f"{method} {endpoint}", 429)
+            return self.send_json(429, {"error": "Rate limit exceeded"}, headers)
+        if self.state.failed():
+            self.state.record(f"{method} {endpoint}", settings["error_status"])
+            return self.send_json(settings["error_status"], {"error": "Injected failure"})
+
+        status, payload = getattr(self, handler_name)(parse_qs(url.query), body, *match.groups())
+        self.state.record(f"{method} {endpoint}", status)
+        self.send_json(status, payload)
+
+    def page_window(self, query, total):
+        """Return (start, end, meta) for a cursor-paginated list of total items."""
+        per_page = min(int(query.get("per_page", ["100"])[0]), self.state.settings["max_per_page"])
+        start = int(query.get("cursor", ["0"])[0] or 0)
+        end = min(start + per_page, total)
+        meta = {
+            "total": total,
+            "links": {"next": str(end) if end < total else "", "prev": ""}
+        }
+        return start, end, meta
+
+    def paginate(self, key, items, query):
+        start, end, meta = self.page_window(query, len(items))
+        return 200, {key: items[start:end], "meta": meta}
+
+    def list_instances(self, query, body):
+        # List responses omit default_password, like the real API.
+        with self.state.lock:
+            start, end, meta = self.page_window(query, len(self.state.order))
+            instances = [
+                {k: v for k, v in self.state.instances[instance_id].items() if k != "default_password"}
+                for instance_id in self.state.order[start:end]
+            ]
+        return 200, {"instances": instances, "meta": meta}
+
+    def get_instance(self, query, body, instance_id):
+        with self.state.lock:
+            instance = self.state.instances.get(instance_id)
+        if instance is None:
+            return 404, {"error": "Invalid instance-id"}
+        return 200, {"instance": instance}
+
+    def create_instance(self, query, body):
+        with self.state.lock:
+            instance = make_instance(self.state.next_index)
+            self.state.next_index += 1
+            instance.update(
+                region=body.get("region", instance["region"]),
+                plan=body.get("plan", instance["plan"]),
+                status="pending",
+                server_status="none",
+                main_ip="0.0.0.0"
+            )
+            self.state.instances[instance["id"]] = instance
+            self.state.order.append(instance["id"])
+        return 202, {"instance": instance}
+
+    def delete_instance(self, query, body, instance_id):
+        with self.state.lock:
+            if self.state.instances.pop(instance_id, None) is None:
+                return 404, {"error": "Invalid instance-id"}
+            self.state.order.remove(instance_id)
+        return 204, None
+
+    def reinstall_instance(self, query, body, instance_id):
+        with self.state.lock:
+            if instance_id not in self.state.instances:
+                return 404, {"error": "Invalid instance-id"}
+        return 204, None
+
+    def list_regions(self, query, body):
+        regions = [{"id": r, "city": r.upper(), "country": "US", "continent": "", "options": []} for r in REGIONS]
+        return self.paginate("regions", regions, query)
+
+    def list_plans(self, query, body):
+        plans = [
+            {"id": p, "monthly_cost": cost, "vcpu_count": vcpu, "ram": ram, "disk": 25, "locations": REGIONS}
+            for p, cost, vcpu, ram in PLANS
+        ]
+        return self.paginate("plans", plans, query)
+
+    def list_os(self, query, body):
+        images = [{"id": os_id, "name": name, "arch": "x64", "family": name.split()[0].lower()}
+                  for os_id, name in OS_IMAGES]
+        return self.paginate("os", images, query)
+
+    def region_availability(self, query, body, region_id):
+        if region_id not in REGIONS:
+            return 404, {"error": "Invalid region"}
+        plans = [p for p, *_ in PLANS]
+        # Every third region lacks the cheapest plan, so availability filtering has work to do.
+        if REGIONS.index(region_id) % 3 == 0:
+            plans = plans[1:]
+        return 200, {"available_plans": plans}
+
+
+def serve(port=0, settings=None):
+    """Start the mock on a background thread; returns the server (see server_address)."""
+    handler = type("BoundHandler", (Handler,), {"state": MockState(settings)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Vultr v2 API stand-in.")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--fleet", type=int, default=DEFAULT_SETTINGS["fleet"])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, {
+        "fleet": args.fleet,
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "throttle_rps": args.throttle_rps
+    })
+    # The first line is machine-readable so harnesses can find the port.
+    print(f"listening on http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
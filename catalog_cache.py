@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+CATALOG_RESOURCES = ("regions", "plans", "os")
+# Bumped when the cached item shape changes; older files are discarded on load.
+# 2: plans are cached unfiltered and compacted, with numeric monthly_cost.
+CACHE_VERSION = 2
+
+# Seconds before a cached catalog is revalidated against the API.
+DEFAULT_TTLS = {
+    "regions": 7 * 24 * 3600,
+    "plans": 24 * 3600,
+    "os": 24 * 3600,
+    # Per-region plan availability, {region_id: [plan_id, ...]}.
+    "availability": 3600,
+}
+
+
+def key_fingerprint(api_key):
+    """Return a short, non-reversible fingerprint of an API key."""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class CatalogCache:
+    """On-disk cache for the regions/plans/OS catalogs, scoped to one API key."""
+
+    def __init__(self, cache_file, api_key="", ttls=None):
+        self.cache_file = cache_file
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self.data = self.load()
+        if api_key:
+            self.set_api_key(api_key)
+
+    def load(self):
+        """Load cache file."""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if (isinstance(data, dict) and data.get("version") == CACHE_VERSION
+                        and isinstance(data.get("entries"), dict)):
+                    return data
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {"version": CACHE_VERSION, "key": "", "entries": {}}
+
+    def save(self):
+        """Write cache file atomically."""
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Catalog cache write failed: {e}", file=sys.stderr)
+
+    def set_api_key(self, api_key):
+        """Switch to api_key, dropping every entry cached for a different key."""
+        fingerprint = key_fingerprint(api_key)
+        with self._lock:
+            if fingerprint == self.data.get("key"):
+                return
+            self.data = {"version": CACHE_VERSION, "key": fingerprint, "entries": {}}
+            self.save()
+
+    def get(self, resource):
+        """Return cached items for resource, or None."""
+        with self._lock:
+            entry = self.data["entries"].get(resource)
+            return entry["items"] if entry else None
+
+    def validators(self, resource):
+        """Return stored ETag/Last-Modified validators for resource."""
+        with self._lock:
+            entry = self.data["entries"].get(resource)
+            return dict(entry.get("validators") or {}) if entry else {}
+
+    def is_fresh(self, resource):
+        with self._lock:
+            entry = self.data["entries"].get(resource)
+            if not entry:
+                return False
+            return time.time() - entry.get("fetched_at", 0) < self.ttls.get(resource, 0)
+
+    def put(self, resource, items, validators=None):
+        with self._lock:
+            self.data["entries"][resource] = {
+                "items": items,
+                "validators": validators or {},
+                "fetched_at": time.time()
+            }
+            self.save()
+
+    def touch(self, resource):
+        """Mark resource as revalidated without changing its items."""
+        with self._lock:
+            entry = self.data["entries"].get(resource)
+            if entry:
+                entry["fetched_at"] = time.time()
+                self.save()
+
+    def invalidate(self, resource=None):
+        """Drop one resource, or every resource when none is given."""
+        with self._lock:
+            if resource is None:
+                self.data["entries"].clear()
+            else:
+                self.data["entries"].pop(resource, None)
+            self.save()
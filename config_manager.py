@@ -1,6 +1,9 @@
 import json
 import os
 
+# Name given to a key saved before accounts existed.
+DEFAULT_ACCOUNT = "default"
+
 class ConfigManager:
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
@@ -17,11 +20,64 @@ class ConfigManager:
         return {"api_key": ""}
 
     def save_config(self, api_key):
-        """Save API key to config file."""
-        self.config["api_key"] = api_key
+        """Save API key to config file (for the active account)."""
+        self.save_account(self.get_active_account() or DEFAULT_ACCOUNT, api_key)
+
+    def write_config(self):
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(self.config, f, indent=2, ensure_ascii=False)
 
-    def get_api_key(self):
-        """Return stored API key."""
-        return self.config.get("api_key", "")
+    def get_setting(self, name, default=None):
+        """Return a stored setting, or default."""
+        return self.config.get(name, default)
+
+    def save_setting(self, name, value):
+        """Save one setting to config file."""
+        self.config[name] = value
+        self.write_config()
+
+    def get_api_key(self, account=None):
+        """Return the API key of account (default: the active account)."""
+        return self.get_accounts().get(account or self.get_active_account(), "")
+
+    def get_accounts(self):
+        """Return {name: api_key} for every saved account, in the order they were added."""
+        accounts = self.config.get("accounts")
+        if isinstance(accounts, dict):
+            return dict(accounts)
+        # Single-key config from before named accounts.
+        api_key = self.config.get("api_key", "")
+        return {DEFAULT_ACCOUNT: api_key} if api_key else {}
+
+    def get_active_account(self):
+        """Return the account used for deploying and catalogs."""
+        accounts = self.get_accounts()
+        name = self.config.get("active_account")
+        if name in accounts:
+            return name
+        return next(iter(accounts), "")
+
+    def save_account(self, name, api_key):
+        """Add or update a named account and make it active."""
+        accounts = self.get_accounts()
+        accounts[name] = api_key
+        self.config["accounts"] = accounts
+        self.set_active_account(name)
+
+    def set_active_account(self, name):
+        self.config["active_account"] = name
+        # Mirror the active key so single-key readers keep working.
+        self.config["api_key"] = self.get_accounts().get(name, "")
+        self.write_config()
+
+    def remove_account(self, name):
+        """Delete a named account; the first remaining one becomes active if needed."""
+        accounts = self.get_accounts()
+        accounts.pop(name, None)
+        self.config["accounts"] = accounts
+        active = self.config.get("active_account")
+        self.set_active_account(active if active in accounts else next(iter(accounts), ""))
+
+    def get_data_path(self, filename):
+        """Return a path for filename next to the config file."""
+        return os.path.join(os.path.dirname(os.path.abspath(self.config_file)), filename)
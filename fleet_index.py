@@ -0,0 +1,99 @@
+from bisect import bisect_left
+
+# Fields matched through per-value dicts (few distinct values per fleet).
+KEYED_FIELDS = ("account", "region", "plan", "os", "status")
+# Fields matched by prefix through sorted arrays (unique per instance).
+PREFIX_FIELDS = ("label", "ip")
+FIELD_ALIASES = {
+    "account": "account",
+    "acct": "account",
+    "region": "region",
+    "plan": "plan",
+    "os": "os",
+    "status": "status",
+    "label": "label",
+    "name": "label",
+    "ip": "ip"
+}
+
+
+def field_value(instance, field):
+    """Return the lowercase value of field for an InstanceRecord."""
+    if field == "ip":
+        return instance.main_ip.lower()
+    return getattr(instance, field).lower()
+
+
+class PrefixIndex:
+    """Sorted (key, position) pairs answering prefix queries by bisection."""
+
+    def __init__(self, pairs):
+        self.entries = sorted(pairs)
+
+    def search(self, prefix):
+        matches = set()
+        index = bisect_left(self.entries, (prefix,))
+        while index < len(self.entries) and self.entries[index][0].startswith(prefix):
+            matches.add(self.entries[index][1])
+            index += 1
+        return matches
+
+
+class FleetIndex:
+    """Secondary indexes over a loaded fleet, built once per refresh.
+
+    filter() takes whitespace-separated terms, ANDed together. A term is
+    either ``field:value`` (account, region, plan, os, status, label/name, ip) or a
+    bare value matched against every field. Keyed fields match values that
+    start with the term; label and IP match by prefix.
+    """
+
+    def __init__(self, instances):
+        self.instances = instances
+        self.keyed = {field: {} for field in KEYED_FIELDS}
+        prefix_pairs = {field: [] for field in PREFIX_FIELDS}
+        for position, instance in enumerate(instances):
+            for field in KEYED_FIELDS:
+                self.keyed[field].setdefault(field_value(instance, field), set()).add(position)
+            for field in PREFIX_FIELDS:
+                prefix_pairs[field].append((field_value(instance, field), position))
+        self.prefix = {field: PrefixIndex(pairs) for field, pairs in prefix_pairs.items()}
+
+    def match_field(self, field, term):
+        if field in self.prefix:
+            return self.prefix[field].search(term)
+        matches = set()
+        for value, positions in self.keyed[field].items():
+            if value.startswith(term):
+                matches |= positions
+        return matches
+
+    def match_term(self, term):
+        field, sep, value = term.partition(":")
+        if sep and field in FIELD_ALIASES:
+            return self.match_field(FIELD_ALIASES[field], value)
+
+        matches = set()
+        for field in PREFIX_FIELDS + KEYED_FIELDS:
+            matches |= self.match_field(field, term)
+        return matches
+
+    def positions(self, query):
+        """Return the sorted positions of instances matching query."""
+        terms = query.lower().split()
+        if not terms:
+            return list(range(len(self.instances)))
+
+        positions = None
+        # Evaluate every term, then intersect starting from the smallest set.
+        for matches in sorted((self.match_term(term) for term in terms), key=len):
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return []
+        return sorted(positions)
+
+    def filter(self, query):
+        """Return the instances matching query, in fleet order."""
+        if not query.split():
+            return self.instances
+        return [self.instances[position] for position in self.positions(query)]
@@ -0,0 +1,131 @@
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from catalog_cache import key_fingerprint
+from instance_record import InstanceRecord
+
+# Bumped when the table layout changes; older stores are recreated on open.
+STORE_VERSION = 1
+# Every record field except default_password, which is never written to disk.
+STORED_FIELDS = tuple(name for name in InstanceRecord.__slots__ if name != "default_password")
+
+
+class FleetStore:
+    """SQLite snapshot of the last fetched fleet, one row per instance.
+
+    Rows are scoped to an account and the fingerprint of its API key, so a
+    replaced key never shows the previous key's servers. Each row carries
+    the time it was fetched; passwords are not stored and stay blank until
+    the instance's card is shown and its detail fetched.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self.init_db()
+
+    @contextmanager
+    def transaction(self):
+        """Yield a connection that commits on success and is always closed."""
+        with self._lock:
+            db = sqlite3.connect(self.db_file, timeout=5)
+            try:
+                with db:
+                    yield db
+            finally:
+                db.close()
+
+    def init_db(self):
+        columns = ", ".join(f"{name} TEXT NOT NULL DEFAULT ''" for name in STORED_FIELDS if name != "account")
+        try:
+            with self.transaction() as db:
+                if db.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                    db.execute("DROP TABLE IF EXISTS instances")
+                    db.execute(f"PRAGMA user_version = {STORE_VERSION}")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS instances ("
+                    "account TEXT NOT NULL, key TEXT NOT NULL, position INTEGER NOT NULL, "
+                    f"{columns}, fetched_at REAL NOT NULL, PRIMARY KEY (account, id))"
+                )
+        except sqlite3.Error as e:
+            print(f"Fleet store init failed: {e}", file=sys.stderr)
+
+    def load(self, accounts):
+        """Return stored records for {name: api_key}, in account then API order."""
+        records = []
+        try:
+            with self.transaction() as db:
+                for name, api_key in accounts.items():
+                    rows = db.execute(
+                        f"SELECT {', '.join(STORED_FIELDS)} FROM instances "
+                        "WHERE account = ? AND key = ? ORDER BY position",
+                        (name, key_fingerprint(api_key))
+                    )
+                    for row in rows:
+                        records.append(InstanceRecord.from_api(dict(zip(STORED_FIELDS, row))))
+        except sqlite3.Error as e:
+            print(f"Fleet store read failed: {e}", file=sys.stderr)
+        return records
+
+    def fetched_at(self, accounts):
+        """Return when the oldest stored account was last fetched, or None."""
+        try:
+            with self.transaction() as db:
+                times = [
+                    db.execute(
+                        "SELECT MAX(fetched_at) FROM instances WHERE account = ? AND key = ?",
+                        (name, key_fingerprint(api_key))
+                    ).fetchone()[0]
+                    for name, api_key in accounts.items()
+                ]
+        except sqlite3.Error as e:
+            print(f"Fleet store read failed: {e}", file=sys.stderr)
+            return None
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    def save_account(self, account, api_key, records, fetched_at=None):
+        """Replace the stored fleet of account with records, in one transaction."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        fingerprint = key_fingerprint(api_key)
+        rows = [
+            (account, fingerprint, position, fetched_at)
+            + tuple(getattr(record, name) for name in STORED_FIELDS if name != "account")
+            for position, record in enumerate(records)
+        ]
+        try:
+            with self.transaction() as db:
+                db.execute("DELETE FROM instances WHERE account = ?", (account,))
+                db.executemany(self.insert_sql(), rows)
+        except sqlite3.Error as e:
+            print(f"Fleet store write failed: {e}", file=sys.stderr)
+
+    def save_record(self, record):
+        """Update one stored instance in place (e.g. after polling it)."""
+        fields = [name for name in STORED_FIELDS if name not in ("account", "id")]
+        try:
+            with self.transaction() as db:
+                db.execute(
+                    f"UPDATE instances SET {', '.join(f'{name} = ?' for name in fields)}, fetched_at = ? "
+                    "WHERE account = ? AND id = ?",
+                    [getattr(record, name) for name in fields] + [time.time(), record.account, record.id]
+                )
+        except sqlite3.Error as e:
+            print(f"Fleet store write failed: {e}", file=sys.stderr)
+
+    def remove_account(self, account):
+        try:
+            with self.transaction() as db:
+                db.execute("DELETE FROM instances WHERE account = ?", (account,))
+        except sqlite3.Error as e:
+            print(f"Fleet store write failed: {e}", file=sys.stderr)
+
+    @staticmethod
+    def insert_sql():
+        columns = ("account", "key", "position", "fetched_at") + tuple(
+            name for name in STORED_FIELDS if name != "account"
+        )
+        return f"INSERT OR REPLACE INTO instances ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
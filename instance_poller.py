@@ -0,0 +1,118 @@
+import threading
+import time
+
+TRANSITIONAL_STATUSES = frozenset({"pending", "resizing"})
+TRANSITIONAL_SERVER_STATUSES = frozenset({"none", "locked", "installingbooting"})
+UNASSIGNED_IPS = frozenset({"", "0.0.0.0"})
+
+INITIAL_INTERVAL = 3.0
+MAX_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+MAX_FAILURES = 5
+
+
+def is_transitional(instance):
+    """Return True while an InstanceRecord is still being provisioned or reinstalled."""
+    if instance.status in TRANSITIONAL_STATUSES:
+        return True
+    if instance.server_status in TRANSITIONAL_SERVER_STATUSES:
+        return True
+    return instance.main_ip in UNASSIGNED_IPS
+
+
+class InstancePoller:
+    """Background poller for instances in transitional states.
+
+    Each watched instance is fetched on its own schedule: the interval grows
+    by BACKOFF_FACTOR while nothing changes and resets when the instance
+    moves. on_update(instance_id, detail) is called from the poller thread
+    whenever a polled instance changed; an instance is dropped once it
+    settles. The thread exits when nothing is left to watch.
+    """
+
+    def __init__(self, get_detail, on_update, initial_interval=INITIAL_INTERVAL,
+                 max_interval=MAX_INTERVAL, backoff=BACKOFF_FACTOR):
+        self.get_detail = get_detail
+        self.on_update = on_update
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._watched = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def watch(self, instance_id, instance=None):
+        with self._cond:
+            if instance_id in self._watched:
+                return
+            self._watched[instance_id] = {
+                "interval": self.initial_interval,
+                "due": time.monotonic() + self.initial_interval,
+                "last": instance,
+                "failures": 0
+            }
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def unwatch(self, instance_id):
+        with self._cond:
+            self._watched.pop(instance_id, None)
+            self._cond.notify()
+
+    def clear(self):
+        with self._cond:
+            self._watched.clear()
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return list(self._watched)
+
+    def _next_due(self):
+        with self._cond:
+            while True:
+                if not self._watched:
+                    self._thread = None
+                    return None
+                instance_id, entry = min(self._watched.items(), key=lambda item: item[1]["due"])
+                wait = entry["due"] - time.monotonic()
+                if wait <= 0:
+                    return instance_id
+                self._cond.wait(wait)
+
+    def _run(self):
+        while True:
+            instance_id = self._next_due()
+            if instance_id is None:
+                return
+
+            detail = self.get_detail(instance_id)
+
+            with self._cond:
+                entry = self._watched.get(instance_id)
+                if entry is None:
+                    continue
+                if not detail:
+                    entry["failures"] += 1
+                    if entry["failures"] >= MAX_FAILURES:
+                        del self._watched[instance_id]
+                        continue
+                    changed = False
+                else:
+                    entry["failures"] = 0
+                    changed = detail != entry["last"]
+                    entry["last"] = detail
+
+                if detail and not is_transitional(detail):
+                    del self._watched[instance_id]
+                else:
+                    if changed:
+                        entry["interval"] = self.initial_interval
+                    else:
+                        entry["interval"] = min(entry["interval"] * self.backoff, self.max_interval)
+                    entry["due"] = time.monotonic() + entry["interval"]
+
+            if changed:
+                self.on_update(instance_id, detail)
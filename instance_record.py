@@ -0,0 +1,59 @@
+import sys
+
+# Low-cardinality fields: one shared string per distinct value across the fleet.
+INTERNED_FIELDS = ("account", "region", "plan", "os", "status", "server_status")
+PLAIN_FIELDS = ("id", "main_ip", "default_password", "date_created")
+
+
+def intern_value(value):
+    return sys.intern(value) if isinstance(value, str) else ""
+
+
+class InstanceRecord:
+    """The fields of a Vultr instance the panel, poller and filters use.
+
+    Built from list and detail payloads, which are then discarded, so a
+    refreshed fleet holds eleven slots per instance instead of two merged
+    API dicts. account names the saved account the instance belongs to.
+    """
+
+    __slots__ = ("id", "label") + INTERNED_FIELDS + ("main_ip", "default_password", "date_created")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, "")
+
+    @classmethod
+    def from_api(cls, data):
+        record = cls()
+        record.update(data)
+        return record
+
+    def update(self, data):
+        """Merge the fields present in an API payload (list item or detail)."""
+        if "label" in data or "hostname" in data:
+            self.label = data.get("label") or data.get("hostname") or ""
+        for name in INTERNED_FIELDS:
+            if name in data:
+                setattr(self, name, intern_value(data[name]))
+        for name in PLAIN_FIELDS:
+            if name in data:
+                setattr(self, name, data[name] or "")
+
+    def update_from(self, other):
+        """Copy every field of another record into this one, keeping identity."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, InstanceRecord):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"InstanceRecord(id={self.id!r}, label={self.label!r}, status={self.status!r})"
@@ -1,18 +1,53 @@
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import flet as ft
 from flet import Colors
-from vultr_api import VultrAPI
-from config_manager import ConfigManager
-import math
+from config_manager import ConfigManager, DEFAULT_ACCOUNT
+from catalog_cache import CatalogCache, CATALOG_RESOURCES
+from instance_poller import InstancePoller, is_transitional
+from fleet_index import FleetIndex
+from fleet_store import FleetStore
+from instance_record import InstanceRecord
+from plan_table import PlanTable
+from vultr_common import MAX_PLAN_COST, request_error
+from background_tasks import TaskRunner
+from ui_updates import UpdateScheduler
+from collections import OrderedDict
 
 class VultrManager:
     PANEL_WIDTH = 400
     FIELD_WIDTH = 360
     LIST_HEIGHT = 390
+    # Server list virtualization: cards have a fixed height so the visible
+    # window can be computed from the scroll offset alone.
+    CARD_HEIGHT = 210
+    CARD_SPACING = 10
+    ROW_EXTENT = CARD_HEIGHT + CARD_SPACING
+    OVERSCAN_ROWS = 2
+    CARD_CACHE_LIMIT = 40
 
     def __init__(self, page: ft.Page):
         self.page = page
+        # Every UI change goes through self.ui.request(), which sends at most one diff per frame.
+        self.ui = UpdateScheduler(self.page.update)
         self.config_manager = ConfigManager()
+        self.catalog_cache = CatalogCache(self.config_manager.get_data_path("catalog_cache.json"))
+        # Last fetched fleet, shown at startup before the first refresh completes.
+        self.fleet_store = FleetStore(self.config_manager.get_data_path("fleet.db"))
+        # One pooled client per saved account; self.api is the active account's,
+        # used for catalogs and deploying.
+        self.apis = {}
         self.api = None
+        self.active_account = ""
+        self.multi_account = False
+        # Every cached plan, sorted by cost; the budget filters it locally.
+        self.plan_table = PlanTable([])
+        self.plan_budget = self.parse_budget(self.config_manager.get_setting("plan_budget"))
+        if self.plan_budget is None:
+            self.plan_budget = MAX_PLAN_COST
 
         self.palette = {
             "bg": "#f4f7fb",
@@ -50,6 +85,9 @@ class VultrManager:
         self.page.window.height = 750
         self.page.window.resizable = False
         self.page.window.maximizable = False
+        # Closing is intercepted so outstanding requests can be aborted first.
+        self.page.window.prevent_close = True
+        self.page.window.on_event = self.on_window_event
         self.page.padding = 12
         self.page.theme_mode = ft.ThemeMode.LIGHT
         self.page.theme = ft.Theme(
@@ -58,42 +96,156 @@ class VultrManager:
         )
         self.page.bgcolor = self.palette["bg"]
 
-        # Pagination
-        self.current_page = 1
-        self.items_per_page = 2
+        # Server list
+        self.scroll_offset = 0.0
+        self.visible_range = (0, 0)
         self.total_servers = []
+        # Servers passing the current filter; what the list actually shows.
+        self.visible_servers = []
+        self.fleet_index = FleetIndex([])
+        self.filter_query = ""
+        self.servers_by_id = {}
+        # Cards keyed by instance id (LRU, bounded); reused across refreshes and patched in place.
+        self.server_cards = OrderedDict()
+        self.selected_ids = set()
+        # Ids whose detail (for the default password) was requested; details
+        # are fetched only for cards on screen, never for the whole fleet.
+        self.detail_requested = set()
+        # Guards the list model above (records, cards, selection and detail
+        # requests): the refresh worker, the poller, detail loads and Flet's
+        # event handlers all read and change it from their own threads.
+        self.model_lock = threading.RLock()
+        # API work runs on background threads; a new refresh cancels the stale one.
+        self.tasks = TaskRunner(self.page.run_thread)
+        self.busy_count = 0
+        self.busy_lock = threading.Lock()
+        self.poller = InstancePoller(self.poll_instance_detail, self.on_instance_polled)
 
         # UI components
+        self.account_dropdown = None
+        self.account_name_input = None
+        self.remove_account_btn = None
         self.api_key_input = None
         self.region_dropdown = None
         self.plan_dropdown = None
+        self.budget_input = None
         self.os_dropdown = None
         self.status_text = None
+        self.metrics_text = None
+        self.export_metrics_btn = None
         self.servers_column = None
-        self.page_text = None
-        self.prev_btn = None
-        self.next_btn = None
+        self.empty_placeholder = None
+        self.range_text = None
+        self.top_spacer = None
+        self.bottom_spacer = None
         self.announcement = None
         self.busy_indicator = None
         self.server_count_text = None
+        self.filter_input = None
+        self.empty_text = None
         self.save_btn = None
         self.query_all_btn = None
+        self.force_refresh_btn = None
         self.buy_btn = None
+        self.count_input = None
+        self.bulk_deploy_btn = None
         self.refresh_btn = None
+        self.selection_text = None
+        self.select_all_btn = None
+        self.clear_selection_btn = None
+        self.bulk_reinstall_btn = None
+        self.bulk_delete_btn = None
         self.action_controls = []
 
+        self.right_panel_slot = None
+        self.pending_accounts = None
+        self.api_lock = threading.Lock()
+
+        # Open the saved accounts' API connections (DNS, TCP, TLS) while the
+        # window is built, so the startup sync starts on warm connections.
+        if self.config_manager.get_accounts():
+            self.pending_accounts = self.config_manager.get_accounts()
+            self.page.run_thread(self.warm_up_api)
+
+        # Show the header and left panel first; the rest is built behind the first frame.
         self.setup_ui()
+        self.finish_setup()
 
-        # Load saved API key
-        saved_key = self.config_manager.get_api_key()
+    def finish_setup(self):
+        self.right_panel_slot.content = self.create_right_panel()
+        # Disabled while API work runs. Refresh, catalog loading, filtering,
+        # selection and copy buttons stay usable: a new refresh supersedes the old one.
+        self.action_controls = [
+            self.account_dropdown,
+            self.account_name_input,
+            self.remove_account_btn,
+            self.api_key_input,
+            self.region_dropdown,
+            self.plan_dropdown,
+            self.os_dropdown,
+            self.save_btn,
+            self.buy_btn,
+            self.count_input,
+            self.bulk_deploy_btn,
+            self.bulk_reinstall_btn,
+            self.bulk_delete_btn
+        ]
+        self.load_saved_accounts()
+        self.ui.request()
+
+    def create_api(self, api_key):
+        # Imported on first use: requests is the heaviest import on the startup path.
+        from vultr_api import VultrAPI
+        from vultr_traffic import traffic_from_env
+        recorder, transport = traffic_from_env()
+        return VultrAPI(api_key, recorder=recorder, transport=transport)
+
+    def load_saved_accounts(self):
+        accounts = self.config_manager.get_accounts()
+        self.active_account = self.config_manager.get_active_account()
+        self.update_account_options(accounts)
+        saved_key = accounts.get(self.active_account)
         if saved_key:
             self.api_key_input.value = saved_key
-            self.api = VultrAPI(saved_key)
+            # The clients (and requests) are created on first use, not at startup.
+            self.pending_accounts = accounts
+            self.show_saved_fleet(accounts)
+            self.page.run_thread(self.sync_saved_fleet)
+            self.catalog_cache.set_api_key(saved_key)
+            if any(self.catalog_cache.get(r) is not None for r in CATALOG_RESOURCES):
+                self.apply_catalog()
+                stale = [r for r in CATALOG_RESOURCES if not self.catalog_cache.is_fresh(r)]
+                if stale or not self.catalog_cache.is_fresh("availability"):
+                    self.page.run_thread(self.revalidate_saved_catalog, stale)
+
+    def show_saved_fleet(self, accounts):
+        """Render the stored snapshot of the fleet; the background sync reconciles it."""
+        records = self.fleet_store.load(accounts)
+        if not records:
+            return
+        self.reconcile_servers(records)
+        fetched_at = time.strftime("%m-%d %H:%M", time.localtime(self.fleet_store.fetched_at(accounts)))
+        self.set_status(f"显示 {fetched_at} 保存的 {len(records)} 台服务器，正在同步...", Colors.BLUE_700, update=False)
+
+    def sync_saved_fleet(self):
+        if self.ensure_api():
+            self.reload_servers()
+
+    def revalidate_saved_catalog(self, resources):
+        if self.ensure_api():
+            self.revalidate_catalog(self.api, resources)
+            # Availability expires within the hour; refetch it after the regions it covers.
+            if not self.catalog_cache.is_fresh("availability"):
+                self.load_availability(self.api)
 
     def setup_ui(self):
         header = self.create_header()
         left_panel = self.create_left_panel()
-        right_panel = self.create_right_panel()
+        self.right_panel_slot = ft.Container(
+            content=ft.ProgressRing(width=24, height=24, stroke_width=2, color=self.palette["accent"]),
+            alignment=ft.alignment.center,
+            width=self.PANEL_WIDTH
+        )
 
         self.announcement = ft.Container(
             content=ft.Row([
@@ -119,24 +271,13 @@ class VultrManager:
             ft.Row([
                 left_panel,
                 ft.VerticalDivider(width=1, color=self.palette["line"]),
-                right_panel
+                self.right_panel_slot
             ], spacing=10, expand=True),
             self.announcement
         ], spacing=12, expand=True)
 
         self.page.add(main_layout)
 
-        self.action_controls = [
-            self.api_key_input,
-            self.region_dropdown,
-            self.plan_dropdown,
-            self.os_dropdown,
-            self.save_btn,
-            self.query_all_btn,
-            self.buy_btn,
-            self.refresh_btn
-        ]
-
     def create_header(self):
         return ft.Container(
             content=ft.Row([
@@ -188,6 +329,27 @@ class VultrManager:
         )
 
     def create_left_panel(self):
+        self.account_dropdown = ft.Dropdown(
+            label="账户",
+            width=self.FIELD_WIDTH - 48,
+            options=[],
+            on_change=self.on_account_change,
+            border_color=self.palette["line"],
+            border_radius=8
+        )
+        self.remove_account_btn = ft.IconButton(
+            icon=ft.Icons.PERSON_REMOVE_OUTLINED,
+            tooltip="删除当前账户",
+            icon_color=self.palette["danger"],
+            on_click=self.remove_account
+        )
+        self.account_name_input = ft.TextField(
+            label="账户名称",
+            value=DEFAULT_ACCOUNT,
+            width=self.FIELD_WIDTH,
+            border_color=self.palette["line"],
+            border_radius=8
+        )
         self.api_key_input = ft.TextField(
             label="API 密钥",
             hint_text="请输入 Vultr API 密钥",
@@ -209,17 +371,27 @@ class VultrManager:
             label="选择区域",
             width=self.FIELD_WIDTH,
             options=[],
+            on_change=self.on_region_change,
             border_color=self.palette["line"],
             border_radius=8
         )
 
         self.plan_dropdown = ft.Dropdown(
-            label="选择套餐（≤ $5/月）",
-            width=self.FIELD_WIDTH,
+            label=self.plan_label(),
+            width=self.FIELD_WIDTH - 98,
             options=[],
             border_color=self.palette["line"],
             border_radius=8
         )
+        self.budget_input = ft.TextField(
+            label="预算 $/月",
+            value=f"{self.plan_budget:g}",
+            width=90,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            on_change=self.on_budget_change,
+            border_color=self.palette["line"],
+            border_radius=8
+        )
 
         self.os_dropdown = ft.Dropdown(
             label="选择系统",
@@ -233,14 +405,36 @@ class VultrManager:
             "一键获取",
             ft.Icons.SEARCH,
             "#2563eb",
-            self.query_all
+            self.query_all,
+            width=self.FIELD_WIDTH - 48
+        )
+        self.force_refresh_btn = ft.IconButton(
+            icon=ft.Icons.CLOUD_SYNC_OUTLINED,
+            tooltip="强制刷新区域/套餐/镜像",
+            icon_color=self.palette["accent"],
+            on_click=self.force_refresh_catalog
         )
 
         self.buy_btn = self.build_action_button(
             "立即购买",
             ft.Icons.SHOPPING_CART_OUTLINED,
             "#0f766e",
-            self.buy_server
+            self.buy_server,
+            width=self.FIELD_WIDTH - 98
+        )
+        self.count_input = ft.TextField(
+            label="数量",
+            value="1",
+            width=90,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            border_color=self.palette["line"],
+            border_radius=8
+        )
+        self.bulk_deploy_btn = self.build_action_button(
+            "批量部署（多区域/套餐/系统）",
+            ft.Icons.DYNAMIC_FEED_OUTLINED,
+            "#0e7490",
+            self.open_bulk_deploy
         )
 
         self.busy_indicator = ft.ProgressRing(
@@ -260,22 +454,40 @@ class VultrManager:
             self.busy_indicator,
             self.status_text
         ], spacing=6)
+        self.metrics_text = ft.Text(
+            value="",
+            size=10,
+            color=self.palette["muted"],
+            width=self.FIELD_WIDTH - 48
+        )
+        self.export_metrics_btn = ft.IconButton(
+            icon=ft.Icons.INSIGHTS_OUTLINED,
+            icon_size=16,
+            tooltip="导出请求指标（JSON / Prometheus）",
+            icon_color=self.palette["accent"],
+            on_click=self.export_metrics
+        )
+        metrics_row = ft.Row([self.metrics_text, self.export_metrics_btn], spacing=4)
 
         return ft.Container(
             content=ft.Column([
                 self.section_header("API 设置", ft.Icons.KEY_OUTLINED),
+                ft.Row([self.account_dropdown, self.remove_account_btn], spacing=8),
+                self.account_name_input,
                 self.api_key_input,
                 self.save_btn,
 
                 ft.Container(height=6),
 
                 self.section_header("购买服务器", ft.Icons.SHOPPING_BAG_OUTLINED),
-                self.query_all_btn,
+                ft.Row([self.query_all_btn, self.force_refresh_btn], spacing=8),
                 self.region_dropdown,
-                self.plan_dropdown,
+                ft.Row([self.plan_dropdown, self.budget_input], spacing=8),
                 self.os_dropdown,
-                self.buy_btn,
+                ft.Row([self.count_input, self.buy_btn], spacing=8),
+                self.bulk_deploy_btn,
                 status_row,
+                metrics_row,
             ], spacing=8, scroll=ft.ScrollMode.AUTO),
             width=self.PANEL_WIDTH,
             padding=12,
@@ -286,9 +498,19 @@ class VultrManager:
         )
 
     def create_right_panel(self):
-        self.servers_column = ft.Column(
-            spacing=10,
-            scroll=ft.ScrollMode.AUTO,
+        self.servers_column = ft.ListView(
+            spacing=self.CARD_SPACING,
+            on_scroll=self.on_list_scroll,
+            on_scroll_interval=30
+        )
+        # Spacers stand in for the rows above and below the built window.
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.empty_text = ft.Text("暂无服务器", size=14, color=self.palette["muted"])
+        self.empty_placeholder = ft.Container(
+            content=self.empty_text,
+            alignment=ft.alignment.center,
+            height=self.LIST_HEIGHT - 50
         )
 
         self.server_count_text = ft.Text("共 0 台", size=11, color=self.palette["muted"])
@@ -305,49 +527,74 @@ class VultrManager:
             border_radius=8
         )
 
-        self.prev_btn = ft.ElevatedButton(
-            text="上一页",
-            on_click=self.prev_page,
-            disabled=True,
-            width=120,
-            height=32,
-            bgcolor=self.palette["panel_alt"],
-            color=self.palette["text"]
-        )
-
-        self.page_text = ft.Text("第 1 页", size=11, color=self.palette["muted"], weight=ft.FontWeight.BOLD)
-
-        self.next_btn = ft.ElevatedButton(
-            text="下一页",
-            on_click=self.next_page,
-            disabled=True,
-            width=120,
-            height=32,
-            bgcolor=self.palette["panel_alt"],
-            color=self.palette["text"]
+        self.filter_input = ft.TextField(
+            hint_text="筛选：标签/IP 前缀，或 region:ewr plan: os: status:",
+            prefix_icon=ft.Icons.FILTER_LIST,
+            width=self.FIELD_WIDTH,
+            height=36,
+            dense=True,
+            text_size=12,
+            content_padding=ft.padding.symmetric(horizontal=8, vertical=4),
+            border_color=self.palette["line"],
+            border_radius=8,
+            on_change=self.on_filter_change
         )
 
-        pagination = ft.Row([
-            self.prev_btn,
-            ft.Container(
-                content=self.page_text,
-                width=100,
-                alignment=ft.alignment.center
-            ),
-            self.next_btn
-        ], alignment=ft.MainAxisAlignment.CENTER)
+        self.range_text = ft.Text("", size=11, color=self.palette["muted"], weight=ft.FontWeight.BOLD)
+        list_footer = ft.Row([self.range_text], alignment=ft.MainAxisAlignment.CENTER)
 
         self.refresh_btn = self.build_action_button(
             "刷新列表",
             ft.Icons.REFRESH,
             self.palette["accent_alt"],
-            self.refresh_servers
+            self.refresh_servers,
+            width=130
+        )
+
+        self.selection_text = ft.Text("已选 0 台", size=11, color=self.palette["muted"], expand=True)
+        self.select_all_btn = ft.IconButton(
+            icon=ft.Icons.SELECT_ALL,
+            icon_size=18,
+            tooltip="全选当前列表中的服务器",
+            icon_color=self.palette["accent"],
+            on_click=self.select_all_servers
+        )
+        self.clear_selection_btn = ft.IconButton(
+            icon=ft.Icons.DESELECT,
+            icon_size=18,
+            tooltip="清除选择",
+            icon_color=self.palette["muted"],
+            on_click=self.clear_selection
+        )
+        self.bulk_reinstall_btn = ft.IconButton(
+            icon=ft.Icons.RESTART_ALT,
+            icon_size=18,
+            tooltip="批量重装",
+            icon_color="#f59e0b",
+            on_click=self.bulk_reinstall,
+            disabled=True
+        )
+        self.bulk_delete_btn = ft.IconButton(
+            icon=ft.Icons.DELETE_SWEEP_OUTLINED,
+            icon_size=18,
+            tooltip="批量删除",
+            icon_color=self.palette["danger"],
+            on_click=self.bulk_delete,
+            disabled=True
         )
 
         return ft.Container(
             content=ft.Column([
                 header,
-                self.refresh_btn,
+                ft.Row([
+                    self.refresh_btn,
+                    self.selection_text,
+                    self.select_all_btn,
+                    self.clear_selection_btn,
+                    self.bulk_reinstall_btn,
+                    self.bulk_delete_btn
+                ], spacing=0),
+                self.filter_input,
                 ft.Container(
                     content=self.servers_column,
                     border=ft.border.all(1, self.palette["line"]),
@@ -358,7 +605,7 @@ class VultrManager:
                     width=self.FIELD_WIDTH,
                     shadow=self.card_shadow
                 ),
-                pagination
+                list_footer
             ], spacing=8),
             width=self.PANEL_WIDTH,
             padding=12,
@@ -371,14 +618,31 @@ class VultrManager:
     def open_official_site(self, e):
         self.page.launch_url("https://github.com/jConjuring/VultrApiPanel")
 
+    def on_window_event(self, e):
+        if e.type == ft.WindowEventType.CLOSE:
+            self.shutdown()
+            self.page.window.destroy()
+
+    def shutdown(self):
+        """Cancel background tasks and abort outstanding API requests."""
+        self.tasks.cancel_all()
+        self.poller.clear()
+        self.ui.close()
+        for api in self.apis.values():
+            api.close()
+
     def set_status(self, message, color=None, update=True):
         self.status_text.value = message
         if color:
             self.status_text.color = color
         if update:
-            self.page.update()
+            self.ui.request()
 
     def set_busy(self, busy, message=None, color=Colors.BLUE_700):
+        # Counted, so overlapping tasks keep the controls disabled until the last one ends.
+        with self.busy_lock:
+            self.busy_count = max(0, self.busy_count + (1 if busy else -1))
+            busy = self.busy_count > 0
         if self.busy_indicator:
             self.busy_indicator.visible = busy
         for control in self.action_controls:
@@ -386,9 +650,46 @@ class VultrManager:
                 control.disabled = busy
         if message:
             self.set_status(message, color, update=False)
-        self.page.update()
+        if not busy:
+            self.update_metrics_text()
+        self.ui.request()
+
+    def update_metrics_text(self):
+        """Summarize API calls so far: totals plus the endpoint that took the most time."""
+        if not self.api or not self.metrics_text:
+            return
+        rows = self.api.metrics.snapshot()
+        if not rows:
+            return
+        totals = self.api.metrics.totals()
+        busiest = rows[0]
+        p95 = busiest["latency_p95"] or 0
+        self.metrics_text.value = (
+            f"请求 {totals['requests']} 次 · 合并 {totals['coalesced']} · 错误 {totals['errors']} · "
+            f"重试 {totals['retries']} · "
+            f"最耗时 {busiest['method']} {busiest['endpoint']} ×{busiest['count']} "
+            f"p95 {p95 * 1000:.0f}ms"
+        )
+
+    def export_metrics(self, e):
+        if not self.api:
+            self.set_status("暂无请求指标", Colors.ORANGE_700)
+            return
+        paths = []
+        for filename, fmt in (("metrics.json", "json"), ("metrics.prom", "prometheus")):
+            path = self.config_manager.get_data_path(filename)
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(self.api.metrics.export(fmt))
+            except OSError:
+                self.set_status("导出请求指标失败", Colors.RED_700)
+                return
+            paths.append(path)
+        self.update_metrics_text()
+        self.set_status(f"请求指标已导出：{'，'.join(paths)}", Colors.GREEN_700)
 
     def ensure_api(self):
+        self.ensure_api_clients()
         if not self.api:
             self.set_status("请先保存 API 密钥", Colors.RED_700)
             return False
@@ -396,67 +697,243 @@ class VultrManager:
 
     def save_api_key(self, e):
         api_key = self.api_key_input.value.strip()
-        if api_key:
-            self.config_manager.save_config(api_key)
-            self.api = VultrAPI(api_key)
-            self.set_status("API 密钥已保存，正在获取数据...", Colors.GREEN_700)
-            self.query_all(None)
-        else:
+        name = (self.account_name_input.value or "").strip() or DEFAULT_ACCOUNT
+        if not api_key:
             self.set_status("请先保存 API 密钥", Colors.RED_700)
+            return
 
-    def query_all(self, e):
+        self.ensure_api_clients()
+        self.config_manager.save_account(name, api_key)
+        previous = self.apis.get(name)
+        if previous is None or previous.api_key != api_key:
+            if previous is not None:
+                previous.close()
+            self.apis[name] = self.create_api(api_key)
+        self.poller.clear()
+        self.activate_account(name)
+        self.set_status(f"账户 {name} 已保存，正在获取数据...", Colors.GREEN_700)
+        self.query_all(None)
+
+    def ensure_api_clients(self):
+        """Create clients for saved accounts that do not have one yet."""
+        with self.api_lock:
+            if self.pending_accounts:
+                for name, api_key in self.pending_accounts.items():
+                    if name not in self.apis:
+                        self.apis[name] = self.create_api(api_key)
+                self.pending_accounts = None
+                self.api = self.apis.get(self.active_account)
+
+    def warm_up_api(self):
+        self.ensure_api_clients()
+        for api in list(self.apis.values()):
+            api.warm_up()
+
+    def activate_account(self, name):
+        """Make name the account used for catalogs and deploying."""
+        self.active_account = name
+        self.api = self.apis.get(name)
+        self.config_manager.set_active_account(name)
+        api_key = self.config_manager.get_api_key(name)
+        self.api_key_input.value = api_key
+        self.account_name_input.value = name
+        self.catalog_cache.set_api_key(api_key)
+        self.update_account_options(self.config_manager.get_accounts())
+
+    def update_account_options(self, accounts):
+        self.account_dropdown.options = [ft.dropdown.Option(key=name, text=name) for name in accounts]
+        self.account_dropdown.value = self.active_account or None
+        self.account_name_input.value = self.active_account or DEFAULT_ACCOUNT
+        self.multi_account = len(accounts) > 1
+        self.remove_account_btn.disabled = not accounts
+
+    def on_account_change(self, e):
+        name = self.account_dropdown.value
+        if not name or name == self.active_account:
+            return
+        self.ensure_api_clients()
+        self.activate_account(name)
+        self.set_status(f"已切换到账户 {name}", Colors.GREEN_700)
+        self.query_all(None)
+
+    def remove_account(self, e):
+        name = self.account_dropdown.value
+        if not name:
+            return
+        self.ensure_api_clients()
+        self.config_manager.remove_account(name)
+        self.fleet_store.remove_account(name)
+        api = self.apis.pop(name, None)
+        if api is not None:
+            api.close()
+        remaining = self.config_manager.get_accounts()
+        if remaining:
+            self.activate_account(self.config_manager.get_active_account())
+            self.set_status(f"账户 {name} 已删除", Colors.GREEN_700)
+            self.query_all(None)
+        else:
+            self.active_account = ""
+            self.api = None
+            self.api_key_input.value = ""
+            self.update_account_options(remaining)
+            self.reconcile_servers([])
+            self.set_status(f"账户 {name} 已删除", Colors.GREEN_700)
+
+    def query_all(self, e, force=False):
         if not self.ensure_api():
             return
+        self.tasks.start("catalog", self.load_all, force)
 
+    def load_all(self, token, force=False):
         self.set_busy(True, "正在获取区域、套餐和镜像...", Colors.BLUE_700)
+        try:
+            # Missing (or forced) catalogs are fetched now; stale cached ones revalidate in the background.
+            api = self.api
+            missing = [r for r in CATALOG_RESOURCES if force or self.catalog_cache.get(r) is None]
+            for resource in missing:
+                token.check()
+                self.revalidate_catalog_resource(api, resource, conditional=not force)
+            stale = [r for r in CATALOG_RESOURCES if r not in missing and not self.catalog_cache.is_fresh(r)]
+
+            self.apply_catalog()
+            if stale:
+                self.page.run_thread(self.revalidate_catalog, api, stale)
+            if force or not self.catalog_cache.is_fresh("availability"):
+                self.page.run_thread(self.load_availability, api)
+
+            token.check()
+            self.reload_servers()
+        finally:
+            self.set_busy(False)
 
-        regions = self.api.get_regions()
-        if regions:
-            self.region_dropdown.options = [
-                ft.dropdown.Option(key=r["id"], text=f"{r['city']} ({r['id']})")
-                for r in regions if r.get("id")
-            ]
-            for option in self.region_dropdown.options:
-                if "ewr" in option.key.lower():
-                    self.region_dropdown.value = option.key
-                    break
+    def force_refresh_catalog(self, e):
+        self.query_all(e, force=True)
+
+    def revalidate_catalog_resource(self, api, resource, conditional=True):
+        validators = self.catalog_cache.validators(resource) if conditional else None
+        result = api.fetch_catalog(resource, validators)
+        if result is None or api is not self.api:
+            return
+        items, new_validators = result
+        if items is None:
+            self.catalog_cache.touch(resource)
         else:
-            self.region_dropdown.options = []
-            self.region_dropdown.value = None
+            self.catalog_cache.put(resource, items, new_validators)
+
+    def revalidate_catalog(self, api, resources):
+        for resource in resources:
+            self.revalidate_catalog_resource(api, resource)
+        if api is self.api:
+            self.apply_catalog()
+            self.ui.request()
+
+    def load_availability(self, api):
+        """Fetch plan availability for every region concurrently and cache it."""
+        region_ids = [r["id"] for r in self.catalog_cache.get("regions") or [] if r.get("id")]
+        if not region_ids:
+            return
 
-        plans = self.api.get_plans()
-        if plans:
-            self.plan_dropdown.options = [
+        availability = dict(self.catalog_cache.get("availability") or {})
+        fetched = False
+        for region_id, plan_ids in api.get_regions_availability(region_ids):
+            if plan_ids is not None:
+                availability[region_id] = plan_ids
+                fetched = True
+
+        if fetched and api is self.api:
+            self.catalog_cache.put("availability", availability)
+            self.refresh_plan_options()
+            self.ui.request()
+
+    def available_plans(self, region):
+        """Return the set of plan ids deployable in region, or None if unknown."""
+        availability = self.catalog_cache.get("availability") or {}
+        if region not in availability:
+            return None
+        return set(availability[region])
+
+    def is_deployable(self, region, plan):
+        available = self.available_plans(region)
+        return available is None or plan in available
+
+    def refresh_plan_options(self):
+        # Filter locally against cached availability; no request per region change.
+        available = self.available_plans(self.region_dropdown.value)
+        plans = self.plan_table.query(max_cost=self.plan_budget)
+        self.set_dropdown_options(
+            self.plan_dropdown,
+            [
                 ft.dropdown.Option(
                     key=p["id"],
-                    text=f"{p['id']} - ${p.get('monthly_cost', 0)}/mo"
+                    text=f"{p['id']} - ${p['monthly_cost']:g}/mo"
                 )
-                for p in plans
-            ]
-            for option in self.plan_dropdown.options:
-                if option.key == "vc2-1c-0.5gb":
-                    self.plan_dropdown.value = option.key
-                    break
-        else:
-            self.plan_dropdown.options = []
-            self.plan_dropdown.value = None
+                for p in plans if available is None or p["id"] in available
+            ],
+            lambda option: option.key == "vc2-1c-0.5gb"
+        )
+
+    def plan_label(self):
+        return f"选择套餐（≤ ${self.plan_budget:g}/月）"
+
+    def parse_budget(self, value):
+        try:
+            budget = float(str(value).strip())
+        except (TypeError, ValueError):
+            return None
+        return budget if budget >= 0 else None
+
+    def on_budget_change(self, e):
+        # Refilters the cached plan table; nothing is fetched or reparsed.
+        budget = self.parse_budget(self.budget_input.value)
+        if budget is None:
+            self.budget_input.error_text = "无效金额"
+            self.ui.request()
+            return
+        self.budget_input.error_text = None
+        if budget != self.plan_budget:
+            self.plan_budget = budget
+            self.config_manager.save_setting("plan_budget", budget)
+            self.plan_dropdown.label = self.plan_label()
+            self.refresh_plan_options()
+        self.ui.request()
+
+    def on_region_change(self, e):
+        self.refresh_plan_options()
+        self.ui.request()
+
+    def set_dropdown_options(self, dropdown, options, is_default):
+        current = dropdown.value
+        dropdown.options = options
+        if current in {option.key for option in options}:
+            return
+        dropdown.value = next((option.key for option in options if is_default(option)), None)
 
-        os_list = self.api.get_os_list()
-        if os_list:
-            sorted_os = self.sort_os_list(os_list)
-            self.os_dropdown.options = [
+    def apply_catalog(self):
+        regions = self.catalog_cache.get("regions") or []
+        self.set_dropdown_options(
+            self.region_dropdown,
+            [
+                ft.dropdown.Option(key=r["id"], text=f"{r['city']} ({r['id']})")
+                for r in regions if r.get("id")
+            ],
+            lambda option: "ewr" in option.key.lower()
+        )
+
+        self.plan_table = PlanTable(self.catalog_cache.get("plans") or [])
+        plans = self.plan_table.query(max_cost=self.plan_budget)
+        self.refresh_plan_options()
+
+        os_list = self.catalog_cache.get("os") or []
+        self.set_dropdown_options(
+            self.os_dropdown,
+            [
                 ft.dropdown.Option(key=str(os["id"]), text=os["name"])
-                for os in sorted_os
-            ]
-            for option in self.os_dropdown.options:
-                if "debian 12" in option.text.lower():
-                    self.os_dropdown.value = option.key
-                    break
-        else:
-            self.os_dropdown.options = []
-            self.os_dropdown.value = None
+                for os in self.sort_os_list(os_list)
+            ],
+            lambda option: "debian 12" in option.text.lower()
+        )
 
-        if regions and plans and os_list:
+        if regions and self.plan_table and os_list:
             self.set_status(
                 f"获取完成！区域:{len(regions)} 套餐:{len(plans)} 镜像:{len(os_list)}",
                 Colors.GREEN_700,
@@ -465,9 +942,6 @@ class VultrManager:
         else:
             self.set_status("获取失败，请检查 API 密钥或网络。", Colors.RED_700, update=False)
 
-        self.refresh_servers(None, show_busy=False)
-        self.set_busy(False)
-
     def sort_os_list(self, os_list):
         priority_order = {
             "debian": 1,
@@ -498,129 +972,594 @@ class VultrManager:
             self.set_status("请选择区域、套餐和系统", Colors.RED_700)
             return
 
-        self.set_busy(True, "正在创建服务器...", Colors.BLUE_700)
+        if not self.is_deployable(region, plan):
+            self.set_status(f"区域 {region} 不支持套餐 {plan}", Colors.RED_700)
+            return
 
-        result = self.api.create_instance(region, plan, int(os_id))
-        if result:
-            self.set_status(
-                f"服务器已创建，ID: {result.get('id', 'N/A')[:8]}...",
-                Colors.GREEN_700,
-                update=False
-            )
-            self.refresh_servers(None, show_busy=False)
-        else:
-            self.set_status("创建服务器失败", Colors.RED_700, update=False)
+        count = self.parse_count(self.count_input.value)
+        if count is None:
+            self.set_status("数量必须是正整数", Colors.RED_700)
+            return
+        if count > 1:
+            self.bulk_create([(region, plan, int(os_id))] * count)
+            return
+        self.tasks.start(None, self.create_server, region, plan, int(os_id))
 
-        self.set_busy(False)
+    def create_server(self, token, region, plan, os_id):
+        self.set_busy(True, "正在创建服务器...", Colors.BLUE_700)
+        try:
+            result = self.api.create_instance(region, plan, os_id)
+            if result:
+                self.set_status(
+                    f"服务器已创建，ID: {result.get('id', 'N/A')[:8]}...",
+                    Colors.GREEN_700,
+                    update=False
+                )
+                token.check()
+                self.reload_servers()
+            else:
+                self.set_status("创建服务器失败", Colors.RED_700, update=False)
+        finally:
+            self.set_busy(False)
 
-    def refresh_servers(self, e, show_busy=True):
+    def parse_count(self, value):
+        try:
+            count = int(str(value).strip())
+        except ValueError:
+            return None
+        return count if count > 0 else None
+
+    def parse_deploy_specs(self, text):
+        """Parse "region plan os_id [count]" lines into (region, plan, os_id) specs."""
+        specs = []
+        for line_no, line in enumerate(text.splitlines(), 1):
+            parts = line.replace(",", " ").split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            if len(parts) not in (3, 4):
+                raise ValueError(f"第 {line_no} 行格式应为：区域 套餐 系统ID [数量]")
+            count = self.parse_count(parts[3]) if len(parts) == 4 else 1
+            if count is None or not parts[2].isdigit():
+                raise ValueError(f"第 {line_no} 行的系统ID或数量无效")
+            specs.extend([(parts[0], parts[1], int(parts[2]))] * count)
+        return specs
+
+    def open_bulk_deploy(self, e):
         if not self.ensure_api():
             return
 
-        if show_busy:
-            self.set_busy(True, "正在刷新服务器列表...", Colors.BLUE_700)
-        else:
-            self.set_status("正在刷新服务器列表...", Colors.BLUE_700)
+        default_line = " ".join(
+            str(value) for value in (
+                self.region_dropdown.value,
+                self.plan_dropdown.value,
+                self.os_dropdown.value,
+                self.count_input.value or "1"
+            ) if value
+        )
+        specs_input = ft.TextField(
+            label="每行一组：区域 套餐 系统ID [数量]",
+            value=default_line,
+            multiline=True,
+            min_lines=6,
+            max_lines=12,
+            width=400,
+            border_color=self.palette["line"],
+            border_radius=8
+        )
 
-        instances = self.api.get_instances()
-        self.total_servers = []
+        def close_dialog(e):
+            dialog.open = False
+            self.ui.request()
 
-        if instances:
-            for inst in instances:
-                detail = self.api.get_instance_detail(inst.get("id"))
-                if detail:
-                    inst.update(detail)
-                self.total_servers.append(inst)
+        def confirm_deploy(e):
+            try:
+                specs = self.parse_deploy_specs(specs_input.value or "")
+            except ValueError as error:
+                self.set_status(str(error), Colors.RED_700)
+                return
+            if not specs:
+                self.set_status("请至少填写一组部署配置", Colors.RED_700)
+                return
+            invalid = next((spec for spec in specs if not self.is_deployable(spec[0], spec[1])), None)
+            if invalid:
+                self.set_status(f"区域 {invalid[0]} 不支持套餐 {invalid[1]}", Colors.RED_700)
+                return
 
-        self.current_page = 1
-        self.update_server_display()
+            dialog.open = False
+            self.ui.request()
+            self.bulk_create(specs)
 
-        if self.total_servers:
-            self.server_count_text.value = f"共 {len(self.total_servers)} 台"
-            self.set_status(f"共 {len(self.total_servers)} 台服务器", Colors.GREEN_700, update=False)
-        else:
-            self.server_count_text.value = "共 0 台"
-            self.set_status("暂无服务器", Colors.GREEN_700, update=False)
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("批量部署", weight=ft.FontWeight.BOLD),
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text("示例：ewr vc2-1c-0.5gb 2136 5", size=11, color=self.palette["muted"]),
+                    specs_input
+                ], spacing=10, tight=True),
+                width=420
+            ),
+            actions=[
+                ft.TextButton("取消", on_click=close_dialog),
+                ft.ElevatedButton(
+                    "开始部署",
+                    bgcolor="#0e7490",
+                    color=Colors.WHITE,
+                    on_click=confirm_deploy
+                )
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
 
-        if show_busy:
-            self.set_busy(False)
-        else:
-            self.page.update()
+        self.page.overlay.append(dialog)
+        dialog.open = True
+        self.ui.request()
 
-    def update_server_display(self):
-        self.servers_column.controls.clear()
+    def bulk_create(self, specs):
+        labels = [f"{region} / {plan} / {os_id}" for region, plan, os_id in specs]
 
-        if not self.total_servers:
-            self.servers_column.controls.append(
-                ft.Container(
-                    content=ft.Text("暂无服务器", size=14, color=self.palette["muted"]),
-                    alignment=ft.alignment.center,
-                    height=self.LIST_HEIGHT - 50
-                )
+        def deploy(token):
+            results = (
+                (index, bool(instance), (instance or {}).get("id", "")[:8] or "创建失败")
+                for index, instance in self.api.create_instances(specs)
             )
-            self.page_text.value = "第 1 页"
-            self.prev_btn.disabled = True
-            self.next_btn.disabled = True
+            self.run_bulk_operation(token, "批量部署", labels, results)
+
+        self.tasks.start(None, deploy)
+
+    def run_bulk_operation(self, token, title, labels, results):
+        """Show per-item progress while results stream in, then refresh the list once.
+
+        results yields (index, ok, message) as each item completes. Runs on a
+        worker thread; once token is cancelled, queued items are dropped.
+        """
+        progress = ft.ProgressBar(value=0, width=400, color=self.palette["accent"])
+        summary = ft.Text(f"0/{len(labels)}", size=11, color=self.palette["muted"])
+        rows = []
+        for label in labels:
+            rows.append(ft.Row([
+                ft.Icon(ft.Icons.HOURGLASS_EMPTY, size=14, color=self.palette["muted"]),
+                ft.Text(label, size=11, expand=True),
+                ft.Text("等待中", size=11, color=self.palette["muted"])
+            ], spacing=6))
+
+        def close_dialog(e):
+            dialog.open = False
+            self.ui.request()
+
+        close_btn = ft.TextButton("关闭", on_click=close_dialog, disabled=True)
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(title, weight=ft.FontWeight.BOLD),
+            content=ft.Container(
+                content=ft.Column([
+                    progress,
+                    summary,
+                    ft.Column(rows, spacing=4, scroll=ft.ScrollMode.AUTO, height=260)
+                ], spacing=8, tight=True),
+                width=420
+            ),
+            actions=[close_btn],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+        with self.ui.batch():
+            self.page.overlay.append(dialog)
+            dialog.open = True
+            self.set_busy(True, f"{title}：共 {len(labels)} 项...", Colors.BLUE_700)
+
+        done = succeeded = 0
+        finished = False
+        try:
+            for index, ok, message in results:
+                if token.cancelled:
+                    break
+                done += 1
+                succeeded += ok
+                icon, _, status = rows[index].controls
+                icon.name = ft.Icons.CHECK_CIRCLE_OUTLINE if ok else ft.Icons.ERROR_OUTLINE
+                icon.color = self.palette["success"] if ok else self.palette["danger"]
+                status.value = message
+                status.color = self.palette["success"] if ok else self.palette["danger"]
+                progress.value = done / len(labels)
+                summary.value = f"{done}/{len(labels)}，成功 {succeeded}，失败 {done - succeeded}"
+                self.ui.request()
+
+            if not token.cancelled:
+                self.reload_servers()
+            finished = True
+        finally:
+            # Always release the controls and let the dialog be closed, even if
+            # a result or the refresh raised.
+            with self.ui.batch():
+                close_btn.disabled = False
+                if finished:
+                    color = Colors.GREEN_700 if succeeded == len(labels) else Colors.ORANGE_700
+                    self.set_status(
+                        f"{title}完成：成功 {succeeded}，失败 {len(labels) - succeeded}", color, update=False
+                    )
+                else:
+                    self.set_status(f"{title}中断：已完成 {done}/{len(labels)}", Colors.RED_700, update=False)
+                self.set_busy(False)
+
+    def refresh_servers(self, e, show_busy=True):
+        if not self.ensure_api():
             return
+        self.tasks.start("refresh", self.load_servers, show_busy)
 
-        total_pages = math.ceil(len(self.total_servers) / self.items_per_page)
-        start_idx = (self.current_page - 1) * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        current_servers = self.total_servers[start_idx:end_idx]
+    def reload_servers(self):
+        """Refresh the list on the calling worker thread, superseding any running refresh."""
+        self.tasks.run("refresh", self.load_servers, False)
 
-        for inst in current_servers:
-            server_card = self.create_server_card(inst)
-            self.servers_column.controls.append(server_card)
+    def load_servers(self, token, show_busy=True):
+        if show_busy:
+            self.set_busy(True, "正在刷新服务器列表...", Colors.BLUE_700)
+        else:
+            self.set_status("正在刷新服务器列表...", Colors.BLUE_700)
+
+        accounts = list(self.apis.items())
+        previous = {}
+        with self.model_lock:
+            for record in self.total_servers:
+                previous.setdefault(record.account, []).append(record)
+        # What each account contributes to the list on screen. An account with
+        # a list already shown (e.g. the stored snapshot) keeps it until its
+        # refresh finishes, then is reconciled, patching only changed cards; an
+        # account with nothing shown streams its pages in as they arrive.
+        shown = {name: previous.get(name, []) for name, _ in accounts}
+
+        def merged():
+            return [record for name, _ in accounts for record in shown[name]]
+
+        # Each account loads on its own thread and is merged as soon as it is
+        # done, so a slow or throttled account never holds up the others.
+        pages = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=max(1, len(accounts)))
+        try:
+            for name, api in accounts:
+                executor.submit(self.fetch_account_pages, token, name, api, pages)
+
+            apis = dict(accounts)
+            loaded = {name: [] for name, _ in accounts}
+            outcomes = {}
+            pending = len(accounts)
+            while pending:
+                name, records, error = pages.get()
+                if token.cancelled:
+                    # Superseded: the newer refresh owns the list and the status.
+                    return
+
+                if records is not None:
+                    loaded[name].extend(records)
+                    if previous.get(name):
+                        continue
+                    shown[name] = loaded[name]
+                    with self.model_lock:
+                        self.total_servers = merged()
+                        if not self.filter_query:
+                            self.visible_servers = self.total_servers
+                        self.update_server_display()
+                        self.server_count_text.value = f"已加载 {len(self.total_servers)} 台"
+                    self.ui.request()
+                    continue
+
+                pending -= 1
+                outcomes[name] = error
+                if error is None:
+                    self.fleet_store.save_account(name, apis[name].api_key, loaded[name])
+                    shown[name] = loaded[name]
+                elif not previous.get(name):
+                    shown[name] = loaded[name]
+                # A failed account keeps showing what was last known rather than a partial fleet.
+                self.reconcile_servers(merged())
+                self.ui.request()
+
+            errors = [(name, outcomes[name]) for name, _ in accounts if outcomes.get(name)]
+            if errors:
+                described = "；".join(
+                    (f"{name}：" if len(accounts) > 1 else "") + self.describe_api_error(error)
+                    for name, error in errors
+                )
+                self.set_status(
+                    f"刷新不完整（已加载 {len(self.total_servers)} 台）：{described}",
+                    Colors.RED_700,
+                    update=False
+                )
+            elif self.total_servers:
+                self.set_status(f"共 {len(self.total_servers)} 台服务器", Colors.GREEN_700, update=False)
+            else:
+                self.set_status("暂无服务器", Colors.GREEN_700, update=False)
+        finally:
+            executor.shutdown(wait=False)
+            if show_busy:
+                self.set_busy(False)
+            else:
+                self.ui.request()
+
+    def fetch_account_pages(self, token, name, api, pages):
+        """Put (name, records, None) on pages for each page of the account's fleet.
+
+        Ends with (name, None, error): error describes the list page that
+        failed, or is None when every page arrived. Only the list is fetched;
+        details are loaded later for the cards on screen (see request_details).
+        """
+        errors = []
+        try:
+            # Identical in-flight GETs are shared by VultrAPI, so an overlapping
+            # refresh joins the requests already running instead of repeating them.
+            for instances in api.iter_instance_pages(errors=errors):
+                # Keep compact records; the raw list payload is dropped.
+                records = [InstanceRecord.from_api(inst) for inst in instances]
+                if token.cancelled:
+                    return
+                account = sys.intern(name)
+                for record in records:
+                    record.account = account
+                pages.put((name, records, None))
+        except Exception as e:
+            errors.append(request_error(None, str(e)))
+        finally:
+            pages.put((name, None, errors[0] if errors else None))
+
+    def api_for(self, instance_id):
+        """Return the client of the account owning instance_id (the active one if unknown)."""
+        inst = self.servers_by_id.get(instance_id)
+        return self.apis.get(inst.account, self.api) if inst else self.api
+
+    def iter_by_account(self, instance_ids, call):
+        """Run call(api, ids) for each account's share of instance_ids, chaining the results."""
+        groups = {}
+        for instance_id in instance_ids:
+            groups.setdefault(self.api_for(instance_id), []).append(instance_id)
+        for api, ids in groups.items():
+            yield from call(api, ids)
+
+    def describe_api_error(self, error):
+        status = error.get("status")
+        if status == 429:
+            return "请求过于频繁，已被 Vultr 限流，请稍后重试"
+        if status in (401, 403):
+            return "API 密钥无效或权限不足"
+        if status is None:
+            return "网络错误，请检查网络连接"
+        return f"接口返回错误 {status}"
 
-        self.page_text.value = f"第 {self.current_page}/{total_pages} 页"
-        self.prev_btn.disabled = (self.current_page <= 1)
-        self.next_btn.disabled = (self.current_page >= total_pages)
+    def update_server_display(self):
+        with self.model_lock:
+            total = len(self.visible_servers)
+            if not total:
+                self.visible_range = (0, 0)
+                self.empty_text.value = "没有匹配的服务器" if self.total_servers else "暂无服务器"
+                self.set_column_controls([self.empty_placeholder])
+                self.range_text.value = ""
+                return
 
-    def prev_page(self, e):
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.update_server_display()
-            self.page.update()
+            first = max(0, int(self.scroll_offset // self.ROW_EXTENT) - self.OVERSCAN_ROWS)
+            rows = -(-self.LIST_HEIGHT // self.ROW_EXTENT) + 1 + 2 * self.OVERSCAN_ROWS
+            first = min(first, max(0, total - rows))
+            last = min(total, first + rows)
+            self.visible_range = (first, last)
+
+            self.top_spacer.height = first * self.ROW_EXTENT
+            self.bottom_spacer.height = (total - last) * self.ROW_EXTENT
+            shown = self.visible_servers[first:last]
+            cards = [self.get_server_card(inst) for inst in shown]
+            self.set_column_controls([self.top_spacer, *cards, self.bottom_spacer])
+            self.trim_card_cache()
+            self.request_details(shown)
+
+            shown_first = min(total, int(self.scroll_offset // self.ROW_EXTENT) + 1)
+            self.range_text.value = f"第 {shown_first} 台 / 共 {total} 台"
+
+    def request_details(self, instances):
+        """Fetch, in the background, the details of shown instances lacking a password."""
+        with self.model_lock:
+            # Streamed pages are not in servers_by_id until reconciled; their
+            # details are requested then, so they merge into the current record.
+            missing = [
+                inst for inst in instances
+                if inst.id and not inst.default_password and inst.id not in self.detail_requested
+                and self.servers_by_id.get(inst.id) is inst
+            ]
+            self.detail_requested.update(inst.id for inst in missing)
+        if missing:
+            self.page.run_thread(self.load_details, [inst.id for inst in missing])
+
+    def load_details(self, instance_ids):
+        """Merge the details of instance_ids into the current records and patch their cards."""
+        def fetch(api, ids):
+            if api is None:
+                # No client yet: the stored snapshot is shown before the sync creates them.
+                return ((instance_id, None) for instance_id in ids)
+            return api.get_instance_details(ids)
+
+        for instance_id, detail in self.iter_by_account(instance_ids, fetch):
+            with self.model_lock:
+                # A refresh may have replaced the record meanwhile; merge into the current one.
+                inst = self.servers_by_id.get(instance_id)
+                if not detail or inst is None:
+                    # Asked again the next time the card is shown.
+                    self.detail_requested.discard(instance_id)
+                    continue
+                inst.update(detail)
+                if instance_id not in self.server_cards:
+                    continue
+                self.get_server_card(inst)
+            self.ui.request()
+
+    def on_list_scroll(self, e):
+        self.scroll_offset = max(0.0, e.pixels)
+        previous = self.visible_range
+        self.update_server_display()
+        if self.visible_range != previous:
+            self.ui.request()
+        else:
+            self.range_text.update()
+
+    def trim_card_cache(self):
+        with self.model_lock:
+            while len(self.server_cards) > self.CARD_CACHE_LIMIT:
+                self.server_cards.popitem(last=False)
+
+    def set_column_controls(self, controls):
+        current = self.servers_column.controls
+        if len(current) != len(controls) or any(a is not b for a, b in zip(current, controls)):
+            self.servers_column.controls = controls
+
+    def reconcile_servers(self, instances):
+        """Replace the fleet with instances, dropping cards of vanished instances."""
+        with self.ui.batch():
+            with self.model_lock:
+                previous = self.servers_by_id
+                for inst in instances:
+                    # List records carry no password; keep the one already fetched,
+                    # unless the instance is being (re)installed and polled anew.
+                    old = previous.get(inst.id)
+                    if old is not None and not inst.default_password and not is_transitional(inst):
+                        inst.default_password = old.default_password
+                self.total_servers = instances
+                self.servers_by_id = {inst.id: inst for inst in instances}
+                self.detail_requested &= self.servers_by_id.keys()
+                self.fleet_index = FleetIndex(instances)
+                self.visible_servers = self.fleet_index.filter(self.filter_query)
+                self.update_count_text()
+                for instance_id in list(self.server_cards):
+                    if instance_id not in self.servers_by_id:
+                        del self.server_cards[instance_id]
+                self.selected_ids &= self.servers_by_id.keys()
+                self.update_selection_bar()
+                for instance_id in self.poller.pending():
+                    if instance_id not in self.servers_by_id:
+                        self.poller.unwatch(instance_id)
+                for instance_id, inst in self.servers_by_id.items():
+                    if is_transitional(inst):
+                        self.poller.watch(instance_id, inst)
+                self.update_server_display()
+
+    def update_count_text(self):
+        if self.filter_query.strip():
+            self.server_count_text.value = f"匹配 {len(self.visible_servers)}/{len(self.total_servers)} 台"
+        else:
+            self.server_count_text.value = f"共 {len(self.total_servers)} 台"
 
-    def next_page(self, e):
-        total_pages = math.ceil(len(self.total_servers) / self.items_per_page)
-        if self.current_page < total_pages:
-            self.current_page += 1
+    def on_filter_change(self, e):
+        with self.model_lock:
+            self.filter_query = self.filter_input.value or ""
+            self.visible_servers = self.fleet_index.filter(self.filter_query)
+            self.update_count_text()
+            self.scroll_offset = 0.0
             self.update_server_display()
-            self.page.update()
-
-    def create_server_card(self, instance):
-        instance_id = instance.get("id", "N/A")
-        ip = instance.get("main_ip", self.password_placeholder)
-        password = instance.get("default_password", "") or self.password_placeholder
-        label = instance.get("label") or instance.get("hostname") or "未命名"
-        region = instance.get("region", "未知区域")
-        plan = instance.get("plan", "未知套餐")
-        os_name = instance.get("os", "未知系统")
+        self.servers_column.scroll_to(offset=0, duration=0)
+        self.ui.request()
+
+    def poll_instance_detail(self, instance_id):
+        api = self.api_for(instance_id)
+        detail = api.get_instance_detail(instance_id) if api else None
+        if not detail:
+            return None
+        record = InstanceRecord.from_api(detail)
+        current = self.servers_by_id.get(instance_id)
+        if current:
+            record.account = current.account
+        return record
+
+    def on_instance_polled(self, instance_id, detail):
+        # Called from the poller thread: patch only this instance's card.
+        with self.model_lock:
+            inst = self.servers_by_id.get(instance_id)
+            if inst is None:
+                return
+            inst.update_from(detail)
+            shown = instance_id in self.server_cards
+            if shown:
+                self.get_server_card(inst)
+        self.fleet_store.save_record(inst)
+        if shown:
+            self.ui.request()
+
+    def card_fields(self, instance):
+        """Return the values a server card displays, in a comparable tuple."""
+        return (
+            instance.label or "未命名",
+            instance.region or "未知区域",
+            instance.plan or "未知套餐",
+            instance.os or "未知系统",
+            instance.status or "unknown",
+            instance.main_ip or self.password_placeholder,
+            instance.default_password or self.password_placeholder,
+            # Only tag cards with their account when several accounts are merged.
+            instance.account if self.multi_account else ""
+        )
 
-        status = instance.get("status", "unknown")
-        status_color = self.palette["success"] if status == "active" else self.palette["warning"]
+    def get_server_card(self, instance):
+        """Return the card for instance, building it once and patching it on change."""
+        instance_id = instance.id
+        with self.model_lock:
+            fields = self.card_fields(instance)
+            card = self.server_cards.get(instance_id)
+            if card is None:
+                card = self.create_server_card(instance_id)
+                self.server_cards[instance_id] = card
+            else:
+                self.server_cards.move_to_end(instance_id)
+            if card["fields"] != fields:
+                self.patch_server_card(card, fields)
+            return card["control"]
+
+    def patch_server_card(self, card, fields):
+        label, region, plan, os_name, status, ip, password, account = fields
+        card["fields"] = fields
+        card["label"].value = label
+        card["meta"].value = f"{account} | {region} | {plan}" if account else f"{region} | {plan}"
+        card["os"].value = os_name
+        card["status"].value = status
+        card["status_box"].bgcolor = self.palette["success"] if status == "active" else self.palette["warning"]
+        card["ip"].value = ip
+        card["password"].value = password[:15] + "..." if len(password) > 15 else password
+
+    def create_server_card(self, instance_id):
+        card = {"fields": None}
+        card["select"] = ft.Checkbox(
+            value=instance_id in self.selected_ids,
+            on_change=lambda e: self.toggle_selection(instance_id, e.control.value)
+        )
+        card["label"] = ft.Text("", size=12, weight=ft.FontWeight.BOLD, color=self.palette["text"])
+        card["meta"] = ft.Text("", size=10, color=self.palette["muted"])
+        card["os"] = ft.Text("", size=10, color=self.palette["muted"])
+        card["status"] = ft.Text("", size=10, color=Colors.WHITE)
+        card["status_box"] = ft.Container(
+            content=card["status"],
+            padding=ft.padding.symmetric(horizontal=6, vertical=2),
+            border_radius=4
+        )
+        card["ip"] = ft.Text("", size=11, selectable=True)
+        card["password"] = ft.Text("", size=11, selectable=True)
+        # Copy buttons read the current values, so patched cards copy fresh data.
+        card["password_copy"] = ft.IconButton(
+            icon=ft.Icons.CONTENT_COPY,
+            icon_size=14,
+            tooltip="复制密码",
+            icon_color=self.palette["accent"],
+            on_click=lambda e: self.copy_password(instance_id)
+        )
 
-        return ft.Container(
+        card["control"] = ft.Container(
             content=ft.Column([
                 ft.Row([
-                    ft.Column([
-                        ft.Text(label, size=12, weight=ft.FontWeight.BOLD, color=self.palette["text"]),
-                        ft.Text(f"{region} | {plan}", size=10, color=self.palette["muted"]),
-                        ft.Text(os_name, size=10, color=self.palette["muted"])
-                    ], spacing=2),
-                    ft.Container(
-                        content=ft.Text(status, size=10, color=Colors.WHITE),
-                        bgcolor=status_color,
-                        padding=ft.padding.symmetric(horizontal=6, vertical=2),
-                        border_radius=4
-                    )
+                    ft.Row([
+                        card["select"],
+                        ft.Column([
+                            card["label"],
+                            card["meta"],
+                            card["os"]
+                        ], spacing=2)
+                    ], spacing=4),
+                    card["status_box"]
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
 
                 ft.Row([
                     ft.Text("IP：", size=11, width=35),
                     ft.Container(
-                        content=ft.Text(ip, size=11, selectable=True),
+                        content=card["ip"],
                         expand=True
                     ),
                     ft.IconButton(
@@ -628,25 +1567,17 @@ class VultrManager:
                         icon_size=14,
                         tooltip="复制 IP",
                         icon_color=self.palette["accent"],
-                        on_click=lambda e, text=ip: self.copy_to_clipboard(text)
+                        on_click=lambda e: self.copy_to_clipboard(card["fields"][5])
                     )
                 ]),
 
                 ft.Row([
                     ft.Text("密码：", size=11, width=70),
                     ft.Container(
-                        content=ft.Text(password[:15] + "..." if len(password) > 15 else password,
-                                size=11, selectable=True),
+                        content=card["password"],
                         expand=True
                     ),
-                    ft.IconButton(
-                        icon=ft.Icons.CONTENT_COPY,
-                        icon_size=14,
-                        tooltip="复制密码",
-                        icon_color=self.palette["accent"],
-                        on_click=lambda e, text=password: self.copy_to_clipboard(text),
-                        disabled=(password == self.password_placeholder)
-                    )
+                    card["password_copy"]
                 ]),
 
                 ft.Row([
@@ -672,8 +1603,10 @@ class VultrManager:
             border_radius=12,
             padding=10,
             bgcolor="#f8fafc",
+            height=self.CARD_HEIGHT,
             shadow=self.card_shadow
         )
+        return card
 
     def copy_to_clipboard(self, text):
         if text == self.password_placeholder:
@@ -682,10 +1615,60 @@ class VultrManager:
             self.page.set_clipboard(text)
             self.set_status(f"已复制: {text[:20]}...", Colors.GREEN_700)
 
-    def reinstall_server(self, instance_id):
-        if not self.ensure_api():
-            return
-
+    def copy_password(self, instance_id):
+        with self.model_lock:
+            inst = self.servers_by_id.get(instance_id)
+            missing = inst is not None and not inst.default_password
+            if missing:
+                self.detail_requested.add(instance_id)
+        if missing:
+            # Not loaded yet (e.g. the card just scrolled in): fetch it now.
+            self.ensure_api_clients()
+            self.load_details([instance_id])
+            inst = self.servers_by_id.get(instance_id)
+        password = inst.default_password if inst is not None else ""
+        self.copy_to_clipboard(password or self.password_placeholder)
+
+    def toggle_selection(self, instance_id, selected):
+        with self.model_lock:
+            if selected:
+                self.selected_ids.add(instance_id)
+            else:
+                self.selected_ids.discard(instance_id)
+            self.update_selection_bar()
+        self.ui.request()
+
+    def set_selection(self, instance_ids):
+        with self.model_lock:
+            self.selected_ids = set(instance_ids)
+            for instance_id, card in self.server_cards.items():
+                card["select"].value = instance_id in self.selected_ids
+            self.update_selection_bar()
+
+    def select_all_servers(self, e):
+        with self.model_lock:
+            self.set_selection([inst.id for inst in self.visible_servers])
+        self.ui.request()
+
+    def clear_selection(self, e):
+        self.set_selection(())
+        self.ui.request()
+
+    def update_selection_bar(self):
+        count = len(self.selected_ids)
+        self.selection_text.value = f"已选 {count} 台"
+        self.bulk_reinstall_btn.disabled = not count
+        self.bulk_delete_btn.disabled = not count
+
+    def selected_labels(self, instance_ids):
+        labels = []
+        for instance_id in instance_ids:
+            inst = self.servers_by_id.get(instance_id)
+            label = (inst.label if inst else "") or "未命名"
+            labels.append(f"{label} ({instance_id[:8]})")
+        return labels
+
+    def build_os_selector(self):
         os_selector = ft.Dropdown(
             label="选择新系统",
             width=350,
@@ -698,10 +1681,20 @@ class VultrManager:
             if "debian 12" in option.text.lower():
                 os_selector.value = option.key
                 break
+        return os_selector
+
+    def bulk_reinstall(self, e):
+        if not self.ensure_api() or not self.selected_ids:
+            return
+
+        with self.model_lock:
+            instance_ids = sorted(self.selected_ids)
+        positions = {instance_id: index for index, instance_id in enumerate(instance_ids)}
+        os_selector = self.build_os_selector()
 
         def close_dialog(e):
             dialog.open = False
-            self.page.update()
+            self.ui.request()
 
         def confirm_reinstall(e):
             if not os_selector.value:
@@ -709,18 +1702,132 @@ class VultrManager:
                 return
 
             dialog.open = False
-            self.page.update()
+            self.ui.request()
+            self.tasks.start(None, reinstall_all, int(os_selector.value))
+
+        def reinstall_all(token, os_id):
+            results = (
+                (positions[instance_id], ok, "已提交重装" if ok else "重装失败")
+                for instance_id, ok in self.iter_by_account(
+                    instance_ids, lambda api, ids: api.reinstall_instances(ids, os_id)
+                )
+            )
+            self.run_bulk_operation(token, "批量重装", self.selected_labels(instance_ids), results)
+            with self.ui.batch():
+                with self.model_lock:
+                    for instance_id in instance_ids:
+                        if instance_id in self.servers_by_id:
+                            self.poller.watch(instance_id, self.servers_by_id[instance_id])
+                self.set_selection(())
+                self.ui.request()
 
-            self.set_busy(True, f"正在重装服务器 {instance_id[:8]}...", Colors.BLUE_700)
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("批量重装系统", weight=ft.FontWeight.BOLD),
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text(f"将重装 {len(instance_ids)} 台服务器", size=12),
+                    ft.Divider(),
+                    os_selector,
+                    ft.Container(height=5),
+                    ft.Text("重装会清空所有数据。", size=11, color=Colors.ORANGE_700)
+                ], spacing=10),
+                width=400
+            ),
+            actions=[
+                ft.TextButton("取消", on_click=close_dialog),
+                ft.ElevatedButton(
+                    "确认重装",
+                    bgcolor="#f59e0b",
+                    color=Colors.WHITE,
+                    on_click=confirm_reinstall
+                )
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
 
-            success = self.api.reinstall_instance(instance_id, int(os_selector.value))
-            if success:
-                self.set_status(f"服务器 {instance_id[:8]} 已重装", Colors.GREEN_700, update=False)
-                self.refresh_servers(None, show_busy=False)
-            else:
-                self.set_status("重装失败", Colors.RED_700, update=False)
+        self.page.overlay.append(dialog)
+        dialog.open = True
+        self.ui.request()
 
-            self.set_busy(False)
+    def bulk_delete(self, e):
+        if not self.ensure_api() or not self.selected_ids:
+            return
+
+        with self.model_lock:
+            instance_ids = sorted(self.selected_ids)
+        positions = {instance_id: index for index, instance_id in enumerate(instance_ids)}
+
+        def close_dialog(e):
+            dialog.open = False
+            self.ui.request()
+
+        def confirm_delete(e):
+            dialog.open = False
+            self.ui.request()
+            self.tasks.start(None, delete_all)
+
+        def delete_all(token):
+            results = (
+                (positions[instance_id], ok, "已删除" if ok else "删除失败")
+                for instance_id, ok in self.iter_by_account(instance_ids, lambda api, ids: api.delete_instances(ids))
+            )
+            self.run_bulk_operation(token, "批量删除", self.selected_labels(instance_ids), results)
+            self.set_selection(())
+            self.ui.request()
+
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("确认批量删除", weight=ft.FontWeight.BOLD),
+            content=ft.Text(f"将删除 {len(instance_ids)} 台服务器，此操作不可撤销，是否继续？", size=12),
+            actions=[
+                ft.TextButton("取消", on_click=close_dialog),
+                ft.ElevatedButton(
+                    "删除",
+                    bgcolor=self.palette["danger"],
+                    color=Colors.WHITE,
+                    on_click=confirm_delete
+                )
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+
+        self.page.overlay.append(dialog)
+        dialog.open = True
+        self.ui.request()
+
+    def reinstall_server(self, instance_id):
+        if not self.ensure_api():
+            return
+
+        os_selector = self.build_os_selector()
+
+        def close_dialog(e):
+            dialog.open = False
+            self.ui.request()
+
+        def confirm_reinstall(e):
+            if not os_selector.value:
+                self.set_status("请选择系统", Colors.RED_700)
+                return
+
+            dialog.open = False
+            self.ui.request()
+            self.tasks.start(None, reinstall, int(os_selector.value))
+
+        def reinstall(token, os_id):
+            self.set_busy(True, f"正在重装服务器 {instance_id[:8]}...", Colors.BLUE_700)
+            try:
+                success = self.api_for(instance_id).reinstall_instance(instance_id, os_id)
+                if success:
+                    self.set_status(f"服务器 {instance_id[:8]} 已重装", Colors.GREEN_700, update=False)
+                    token.check()
+                    self.reload_servers()
+                    self.poller.watch(instance_id, self.servers_by_id.get(instance_id))
+                else:
+                    self.set_status("重装失败", Colors.RED_700, update=False)
+            finally:
+                self.set_busy(False)
 
         dialog = ft.AlertDialog(
             modal=True,
@@ -749,7 +1856,7 @@ class VultrManager:
 
         self.page.overlay.append(dialog)
         dialog.open = True
-        self.page.update()
+        self.ui.request()
 
     def delete_server(self, instance_id):
         if not self.ensure_api():
@@ -757,22 +1864,25 @@ class VultrManager:
 
         def close_dialog(e):
             dialog.open = False
-            self.page.update()
+            self.ui.request()
 
         def confirm_delete(e):
             dialog.open = False
-            self.page.update()
+            self.ui.request()
+            self.tasks.start(None, delete)
 
+        def delete(token):
             self.set_busy(True, f"正在删除服务器 {instance_id[:8]}...", Colors.BLUE_700)
-
-            success = self.api.delete_instance(instance_id)
-            if success:
-                self.set_status(f"服务器 {instance_id[:8]} 已删除", Colors.GREEN_700, update=False)
-                self.refresh_servers(None, show_busy=False)
-            else:
-                self.set_status("删除失败", Colors.RED_700, update=False)
-
-            self.set_busy(False)
+            try:
+                success = self.api_for(instance_id).delete_instance(instance_id)
+                if success:
+                    self.set_status(f"服务器 {instance_id[:8]} 已删除", Colors.GREEN_700, update=False)
+                    token.check()
+                    self.reload_servers()
+                else:
+                    self.set_status("删除失败", Colors.RED_700, update=False)
+            finally:
+                self.set_busy(False)
 
         dialog = ft.AlertDialog(
             modal=True,
@@ -792,7 +1902,7 @@ class VultrManager:
 
         self.page.overlay.append(dialog)
         dialog.open = True
-        self.page.update()
+        self.ui.request()
 
 def main(page: ft.Page):
     VultrManager(page)
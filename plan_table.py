@@ -0,0 +1,43 @@
+from bisect import bisect_left, bisect_right
+
+
+def range_positions(pairs, low, high):
+    """Positions whose value lies in [low, high] in sorted (value, position) pairs."""
+    start = 0 if low is None else bisect_left(pairs, (low,))
+    end = len(pairs) if high is None else bisect_right(pairs, (high, float("inf")))
+    return {position for _, position in pairs[start:end]}
+
+
+class PlanTable:
+    """Compact plans sorted by monthly cost, built once per catalog load.
+
+    query() answers budget, vCPU and RAM range queries by bisection: cost
+    bounds slice the cost-sorted table directly, vCPU and RAM bounds bisect
+    their own sorted orders. Results are always cheapest first.
+    """
+
+    def __init__(self, plans):
+        self.plans = sorted(plans, key=lambda p: (p["monthly_cost"], p["id"]))
+        self.costs = [p["monthly_cost"] for p in self.plans]
+        self.by_vcpu = sorted((p.get("vcpu_count") or 0, i) for i, p in enumerate(self.plans))
+        self.by_ram = sorted((p.get("ram") or 0, i) for i, p in enumerate(self.plans))
+
+    def __len__(self):
+        return len(self.plans)
+
+    def query(self, max_cost=None, min_cost=None, min_vcpu=None, max_vcpu=None, min_ram=None, max_ram=None):
+        """Return plans within every given bound, cheapest first. RAM is in MB."""
+        start = 0 if min_cost is None else bisect_left(self.costs, min_cost)
+        end = len(self.costs) if max_cost is None else bisect_right(self.costs, max_cost)
+        if start >= end:
+            return []
+
+        positions = None
+        if min_vcpu is not None or max_vcpu is not None:
+            positions = range_positions(self.by_vcpu, min_vcpu, max_vcpu)
+        if min_ram is not None or max_ram is not None:
+            ram = range_positions(self.by_ram, min_ram, max_ram)
+            positions = ram if positions is None else positions & ram
+        if positions is None:
+            return self.plans[start:end]
+        return [self.plans[i] for i in sorted(positions) if start <= i < end]
@@ -0,0 +1,177 @@
+"""In-memory request metrics for VultrAPI and AsyncVultrAPI.
+
+Every API call is recorded under its method and endpoint template
+(``GET /instances/{id}``) with its latency, final status, retry count and
+response size. Counters and latency histograms are cumulative; percentiles
+come from a bounded window of recent samples, so they track current load.
+"""
+import json
+import math
+import threading
+from collections import deque
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Recent latencies kept per endpoint for percentiles.
+RECENT_SAMPLES = 512
+# Status label for requests that never got a response.
+NETWORK_ERROR = "error"
+
+
+def endpoint_template(path):
+    """Collapse ids in a Vultr path: /instances/abc/reinstall -> /instances/{id}/reinstall.
+
+    Vultr paths alternate collection and id segments, so every second
+    segment is an id.
+    """
+    path = path.split("?", 1)[0]
+    parts = [part for part in path.split("/") if part]
+    return "/" + "/".join("{id}" if i % 2 else part for i, part in enumerate(parts))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return round(sorted_values[index], 6)
+
+
+class EndpointStats:
+    """Counters and latency histogram for one method + endpoint template."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.statuses = {}
+        self.retries = 0
+        self.coalesced = 0
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def record(self, status, latency, retries, size):
+        self.count += 1
+        label = NETWORK_ERROR if status is None else str(status)
+        self.statuses[label] = self.statuses.get(label, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+        self.retries += retries
+        self.response_bytes += size
+        self.latency_sum += latency
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[i] += 1
+        self.recent.append(latency)
+
+    def snapshot(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "response_bytes": self.response_bytes,
+            "latency_sum": round(self.latency_sum, 6),
+            "latency_avg": round(self.latency_sum / self.count, 6) if self.count else None,
+            "latency_p50": percentile(recent, 0.5),
+            "latency_p95": percentile(recent, 0.95),
+            "latency_max": round(recent[-1], 6) if recent else None,
+            "statuses": dict(self.statuses),
+            "buckets": dict(zip(map(str, LATENCY_BUCKETS), self.buckets)),
+        }
+
+
+class RequestMetrics:
+    """Thread-safe registry of EndpointStats keyed by (method, endpoint template)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _stats(self, method, path):
+        key = (method.upper(), endpoint_template(path))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def record(self, method, path, status, latency, retries=0, size=0):
+        """Record one API call; status is None when the request failed outright."""
+        with self._lock:
+            self._stats(method, path).record(status, latency, retries, size)
+
+    def record_coalesced(self, method, path):
+        """Count a call that reused another caller's in-flight request."""
+        with self._lock:
+            self._stats(method, path).coalesced += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        """Return [{"method", "endpoint", ...stats}], busiest endpoints (by total time) first."""
+        with self._lock:
+            rows = [
+                dict(method=method, endpoint=endpoint, **stats.snapshot())
+                for (method, endpoint), stats in self._endpoints.items()
+            ]
+        return sorted(rows, key=lambda row: -row["latency_sum"])
+
+    def totals(self):
+        rows = self.snapshot()
+        return {
+            "requests": sum(row["count"] for row in rows),
+            "errors": sum(row["errors"] for row in rows),
+            "retries": sum(row["retries"] for row in rows),
+            "coalesced": sum(row["coalesced"] for row in rows),
+            "response_bytes": sum(row["response_bytes"] for row in rows),
+            "latency_sum": round(sum(row["latency_sum"] for row in rows), 6),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps({"totals": self.totals(), "endpoints": self.snapshot()}, indent=indent)
+
+    def to_prometheus(self, prefix="vultr_api"):
+        """Render the metrics in the Prometheus text exposition format."""
+        rows = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def labels(row, **extra):
+            pairs = dict(method=row["method"], endpoint=row["endpoint"], **extra)
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs.items()) + "}"
+
+        family("requests_total", "counter", "API calls by final status.")
+        for row in rows:
+            for status, n in sorted(row["statuses"].items()):
+                lines.append(f"{prefix}_requests_total{labels(row, status=status)} {n}")
+
+        family("retries_total", "counter", "Retried attempts.")
+        for row in rows:
+            lines.append(f"{prefix}_retries_total{labels(row)} {row['retries']}")
+
+        family("coalesced_total", "counter", "Calls served by another caller's in-flight request.")
+        for row in rows:
+            lines.append(f"{prefix}_coalesced_total{labels(row)} {row['coalesced']}")
+
+        family("response_bytes_total", "counter", "Response body bytes received.")
+        for row in rows:
+            lines.append(f"{prefix}_response_bytes_total{labels(row)} {row['response_bytes']}")
+
+        family("request_duration_seconds", "histogram", "Call latency including retries.")
+        for row in rows:
+            for bound, n in row["buckets"].items():
+                lines.append(f"{prefix}_request_duration_seconds_bucket{labels(row, le=bound)} {n}")
+            lines.append(f'{prefix}_request_duration_seconds_bucket{labels(row, le="+Inf")} {row["count"]}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{labels(row)} {row['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{labels(row)} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, fmt):
+        """Return the metrics as "json" or "prometheus" text."""
+        return self.to_prometheus() if fmt == "prometheus" else self.to_json()
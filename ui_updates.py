@@ -0,0 +1,81 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Minimum seconds between page diffs (~30 per second).
+FRAME_INTERVAL = 1 / 30
+
+
+class UpdateScheduler:
+    """Coalesces page.update() calls into at most one flush per frame.
+
+    request() marks the page dirty. If no flush went out during the last
+    frame it flushes right away; otherwise a single timer flushes at the
+    end of the frame, carrying every change made meanwhile. Inside batch()
+    nothing is flushed until the outermost batch exits, which sends one
+    diff for the whole group of changes; keep API calls out of batches.
+    """
+
+    def __init__(self, update, interval=FRAME_INTERVAL):
+        self.update = update
+        self.interval = interval
+        self.closed = False
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._depth = 0
+        self._last_flush = 0.0
+        self._timer = None
+
+    def request(self):
+        """Mark the page dirty; it is flushed within one frame."""
+        with self._lock:
+            if self.closed:
+                return
+            self._dirty = True
+            if self._depth or self._timer:
+                return
+            wait = self._last_flush + self.interval - time.monotonic()
+            if wait > 0:
+                self._timer = threading.Timer(wait, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._depth:
+                return
+        self.flush()
+
+    def flush(self):
+        """Send pending changes now, unless a batch is open."""
+        with self._lock:
+            if self.closed or self._depth or not self._dirty:
+                return
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        self.update()
+
+    @contextmanager
+    def batch(self):
+        """Group changes into one flush, sent when the outermost batch exits."""
+        with self._lock:
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                done = not self._depth
+            if done:
+                self.flush()
+
+    def close(self):
+        """Drop pending changes and stop flushing (the window is going away)."""
+        with self._lock:
+            self.closed = True
+            timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
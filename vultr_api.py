@@ -1,120 +1,340 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
 
-DEFAULT_TIMEOUT = 15
+from request_metrics import RequestMetrics
+from vultr_common import (
+    API_BASE_URL,
+    CATALOG_ITEM_PARSERS,
+    CATALOG_PARSERS,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_TIMEOUTS,
+    MAX_PLAN_COST,
+    MAX_RETRIES,
+    SingleFlight,
+    auth_headers,
+    compact_items,
+    compact_plan,
+    conditional_headers,
+    default_pool_size,
+    flight_key,
+    filter_affordable_plans,
+    instance_payload,
+    make_rate_limiter,
+    operation_kind,
+    parse_availability,
+    parse_instance,
+    parse_no_content,
+    parse_page,
+    parse_reinstall,
+    reinstall_payload,
+    request_error,
+    response_validators,
+    retry_delay,
+    should_retry,
+    sort_regions,
+)
 
 class VultrAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, max_workers=DEFAULT_CONCURRENCY, page_size=DEFAULT_PAGE_SIZE,
+                 rate_limit=DEFAULT_RATE_LIMIT, max_retries=MAX_RETRIES, recorder=None, transport=None,
+                 timeouts=None, pool_size=None, compress=True):
         self.api_key = api_key
-        self.base_url = "https://api.vultr.com/v2"
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.rate_limiter = make_rate_limiter(rate_limit)
+        self.max_retries = max_retries
+        self.last_error = None
+        self.metrics = RequestMetrics()
+        # Optional vultr_traffic hooks: a TrafficRecorder, and a replacement for the HTTP session.
+        self.recorder = recorder
+        self.transport = transport
+        # Identical concurrent GETs share one in-flight request.
+        self.single_flight = SingleFlight()
+        self.base_url = API_BASE_URL
+        self.headers = auth_headers(api_key, compress)
+        # (connect, read) seconds by operation kind, and keep-alive connections per host.
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.pool_size = pool_size or default_pool_size(max_workers)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._closed = threading.Event()
 
-    def _request(self, method, path, **kwargs):
+    @property
+    def session(self):
+        """The pooled HTTP session, created on first request."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    # Sized to the fan-out, so concurrent calls reuse warm
+                    # connections instead of opening and discarding extras.
+                    # Retries are ours (see _send), not urllib3's.
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def warm_up(self):
+        """Open a pooled connection to the API host (DNS, TCP and TLS) ahead of the first call.
+
+        Returns True if a connection is now pooled. Not counted in metrics.
+        """
+        if self.transport or self.closed:
+            return False
         try:
-            return self.session.request(
-                method,
-                f"{self.base_url}{path}",
-                timeout=DEFAULT_TIMEOUT,
-                **kwargs
-            )
+            self.session.head(self.base_url, timeout=self.timeouts["get"]).close()
+            return True
         except requests.RequestException as e:
-            print(f"Request failed: {e}")
-            return None
+            print(f"Warm-up failed: {e}", file=sys.stderr)
+            return False
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
+
+    def close(self):
+        """Abort outstanding work: pending retries and waits return, and new requests fail fast."""
+        self._closed.set()
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
 
-    def get_plans(self):
-        """Fetch plans with monthly cost <= 5 USD."""
-        response = self._request("GET", "/plans")
-        if not response or response.status_code != 200:
-            return []
+    def _throttle(self):
+        if self.rate_limiter:
+            delay = self.rate_limiter.reserve()
+            if delay:
+                self._closed.wait(delay)
+
+    def _request(self, method, path, **kwargs):
+        if method != "GET":
+            return self._send(method, path, **kwargs)
+        response, shared = self.single_flight.do(
+            flight_key(method, path, kwargs),
+            lambda: self._send(method, path, **kwargs)
+        )
+        if shared:
+            self.metrics.record_coalesced(method, path)
+        return response
 
-        def parse_cost(value):
+    def _send(self, method, path, **kwargs):
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            self._throttle()
+            if self.closed:
+                self.last_error = request_error(None, "client closed")
+                return None
+            url = f"{self.base_url}{path}"
+            sent = time.monotonic()
             try:
-                return float(value)
-            except (TypeError, ValueError):
+                response = (self.transport or self.session).request(
+                    method,
+                    url,
+                    timeout=self.timeouts[operation_kind(method, kwargs)],
+                    **kwargs
+                )
+            except requests.RequestException as e:
+                print(f"Request failed: {e}", file=sys.stderr)
+                self.last_error = request_error(None, str(e))
+                self.metrics.record(method, path, None, time.monotonic() - started, attempt)
                 return None
+            if self.recorder:
+                self.recorder.record(
+                    method, url, kwargs.get("params"), kwargs.get("json"), response, time.monotonic() - sent
+                )
 
-        all_plans = response.json().get("plans", [])
-        affordable_plans = []
-        for plan in all_plans:
-            cost = parse_cost(plan.get("monthly_cost"))
-            if cost is not None and cost <= 5.0:
-                affordable_plans.append(plan)
+            if should_retry(method, response.status_code, attempt, self.max_retries):
+                self._closed.wait(retry_delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
 
-        return sorted(
-            affordable_plans,
-            key=lambda p: (parse_cost(p.get("monthly_cost")) or 0, p.get("id", ""))
-        )
+            if response.status_code >= 400:
+                self.last_error = request_error(response.status_code, f"{method} {path} -> {response.status_code}")
+            self.metrics.record(
+                method, path, response.status_code, time.monotonic() - started, attempt, len(response.content)
+            )
+            return response
+
+    def _iter_pages(self, path, key, per_page=None, cursor=None, errors=None):
+        """Yield each page of a list endpoint, following meta.links.next cursors.
+
+        A failed page ends the iteration; if errors is a list, the failure is
+        appended to it, so callers can tell a partial list from a complete one.
+        """
+        params = {"per_page": per_page or self.page_size}
+        if cursor:
+            params["cursor"] = cursor
+        while True:
+            response = self._request("GET", path, params=params)
+            page = parse_page(response, key)
+            if page is None:
+                if errors is not None:
+                    status = response.status_code if response else None
+                    errors.append(request_error(status, f"GET {path} -> {status}"))
+                return
+
+            items, cursor = page
+            yield items
+
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    def _iter_items(self, path, key, per_page=None, cursor=None, parse_item=None, errors=None):
+        for page in self._iter_pages(path, key, per_page, cursor, errors):
+            yield from compact_items(page, parse_item)
+
+    def iter_instance_pages(self, per_page=None, errors=None):
+        """Yield server instances one page at a time; see _iter_pages for errors."""
+        return self._iter_pages("/instances", "instances", per_page, errors=errors)
+
+    def iter_instances(self, per_page=None):
+        """Yield server instances across all pages."""
+        return self._iter_items("/instances", "instances", per_page)
+
+    def iter_plans(self, per_page=None):
+        """Yield plans across all pages."""
+        return self._iter_items("/plans", "plans", per_page)
+
+    def iter_os(self, per_page=None):
+        """Yield OS images across all pages."""
+        return self._iter_items("/os", "os", per_page)
+
+    def iter_regions(self, per_page=None):
+        """Yield regions across all pages."""
+        return self._iter_items("/regions", "regions", per_page)
+
+    def get_plans(self, max_cost=MAX_PLAN_COST):
+        """Fetch plans costing at most max_cost USD per month, cheapest first."""
+        return filter_affordable_plans(self._iter_items("/plans", "plans", parse_item=compact_plan), max_cost)
 
     def get_os_list(self):
         """Fetch OS images."""
-        response = self._request("GET", "/os")
-        if not response or response.status_code != 200:
-            return []
-        return response.json().get("os", [])
+        return list(self.iter_os())
 
     def create_instance(self, region, plan, os_id):
         """Create a server instance."""
-        data = {
-            "region": region,
-            "plan": plan,
-            "os_id": os_id,
-            "enable_ipv6": False,
-            "backups": "disabled",
-            "ddos_protection": False,
-            "activation_email": False
-        }
-
-        response = self._request("POST", "/instances", json=data)
-        if response and response.status_code == 202:
-            return response.json().get("instance", {})
-        return None
+        response = self._request("POST", "/instances", json=instance_payload(region, plan, os_id))
+        return parse_instance(response, expected_status=202)
 
     def get_instances(self):
         """Fetch all server instances."""
-        response = self._request("GET", "/instances")
-        if response and response.status_code == 200:
-            return response.json().get("instances", [])
-        return []
+        return list(self.iter_instances())
 
     def get_instance_detail(self, instance_id):
         """Fetch detailed instance info (including password)."""
-        response = self._request("GET", f"/instances/{instance_id}")
-        if response and response.status_code == 200:
-            return response.json().get("instance", {})
-        return None
+        return parse_instance(self._request("GET", f"/instances/{instance_id}"))
+
+    def _map_concurrently(self, func, items, max_workers=None):
+        """Run func(item) on a bounded thread pool, yielding (item, result) as each completes."""
+        items = list(items)
+        if not items:
+            return
+
+        workers = max(1, min(max_workers or self.max_workers, len(items)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # If the caller stops early (a cancelled refresh), queued calls are dropped.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_instance_details(self, instance_ids, max_workers=None):
+        """Fetch instance details concurrently, yielding (id, detail) as each completes."""
+        instance_ids = [instance_id for instance_id in instance_ids if instance_id]
+        return self._map_concurrently(self.get_instance_detail, instance_ids, max_workers)
+
+    def create_instances(self, specs, max_workers=None):
+        """Create instances concurrently from (region, plan, os_id) specs.
+
+        Yields (index, instance) as each request completes; instance is None
+        for failures. Indexes refer to positions in specs.
+        """
+        specs = list(specs)
+        return self._map_concurrently(
+            lambda index: self.create_instance(*specs[index]),
+            range(len(specs)),
+            max_workers
+        )
 
     def reinstall_instance(self, instance_id, os_id=None):
         """Reinstall OS for the instance."""
-        if os_id:
-            response = self._request(
-                "POST",
-                f"/instances/{instance_id}/reinstall",
-                json={"os_id": os_id}
-            )
+        payload = reinstall_payload(os_id)
+        if payload:
+            response = self._request("POST", f"/instances/{instance_id}/reinstall", json=payload)
         else:
             response = self._request("POST", f"/instances/{instance_id}/reinstall")
-
-        if not response:
-            return False
-
-        if response.status_code != 204:
-            print(f"Reinstall status: {response.status_code}")
-            print(f"Reinstall response: {response.text}")
-        return response.status_code == 204
+        return parse_reinstall(response)
 
     def delete_instance(self, instance_id):
         """Delete a server instance."""
-        response = self._request("DELETE", f"/instances/{instance_id}")
-        return bool(response and response.status_code == 204)
+        return parse_no_content(self._request("DELETE", f"/instances/{instance_id}"))
+
+    def reinstall_instances(self, instance_ids, os_id=None, max_workers=None):
+        """Reinstall instances concurrently, yielding (id, success) as each completes."""
+        return self._map_concurrently(
+            lambda instance_id: self.reinstall_instance(instance_id, os_id),
+            instance_ids,
+            max_workers
+        )
+
+    def delete_instances(self, instance_ids, max_workers=None):
+        """Delete instances concurrently, yielding (id, success) as each completes."""
+        return self._map_concurrently(self.delete_instance, instance_ids, max_workers)
 
     def get_regions(self):
         """Fetch available regions."""
-        response = self._request("GET", "/regions")
-        if not response or response.status_code != 200:
-            return []
-        regions = response.json().get("regions", [])
-        return sorted(regions, key=lambda r: (r.get("city", ""), r.get("id", "")))
+        return sort_regions(self.iter_regions())
+
+    def get_region_availability(self, region_id):
+        """Fetch the plan ids deployable in a region; None on failure."""
+        return parse_availability(self._request("GET", f"/regions/{region_id}/availability"))
+
+    def get_regions_availability(self, region_ids, max_workers=None):
+        """Fetch availability for many regions concurrently, yielding (region_id, plan_ids)."""
+        return self._map_concurrently(self.get_region_availability, region_ids, max_workers)
+
+    def fetch_catalog(self, resource, validators=None):
+        """Conditionally fetch a catalog ("regions", "plans" or "os").
+
+        Returns (items, validators); items is None when the server answered
+        304 Not Modified. Returns None if the request, or any later page,
+        failed: a truncated catalog is never returned as complete.
+        """
+        validators = validators or {}
+        path = f"/{resource}"
+        response = self._request(
+            "GET",
+            path,
+            params={"per_page": self.page_size},
+            headers=conditional_headers(validators)
+        )
+        if response is not None and response.status_code == 304:
+            return None, validators
+
+        page = parse_page(response, resource)
+        if page is None:
+            return None
+
+        # Each page is trimmed to the fields the panel uses as it arrives.
+        parse_item = CATALOG_ITEM_PARSERS.get(resource)
+        items, cursor = page
+        items = compact_items(items, parse_item)
+        if cursor:
+            errors = []
+            items.extend(self._iter_items(path, resource, cursor=cursor, parse_item=parse_item, errors=errors))
+            if errors:
+                return None
+        return CATALOG_PARSERS[resource](items), response_validators(response)
@@ -0,0 +1,297 @@
+"""Headless command-line interface to the Vultr panel.
+
+Run with ``python -m vultr_cli <command>``. Never imports Flet, so it is
+safe for cron and CI. Output is NDJSON (one object per line) by default,
+or a single JSON document with ``--format json``. ``--metrics`` writes
+per-endpoint request metrics to stderr, keeping stdout machine-readable.
+"""
+import argparse
+import json
+import os
+import sys
+
+from catalog_cache import CATALOG_RESOURCES, CatalogCache
+from config_manager import ConfigManager
+from fleet_index import FleetIndex
+from instance_record import InstanceRecord
+from plan_table import PlanTable
+from vultr_api import VultrAPI
+from vultr_traffic import ReplayTransport, TrafficRecorder
+from vultr_common import DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT, MAX_PLAN_COST
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+
+
+class Output:
+    """Writes records as NDJSON while streaming, or collects them for one JSON array."""
+
+    def __init__(self, fmt, stream=None):
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self.records = []
+
+    def emit(self, record):
+        if self.fmt == "ndjson":
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        else:
+            self.records.append(record)
+
+    def close(self):
+        if self.fmt == "json":
+            json.dump(self.records, self.stream, ensure_ascii=False, indent=2)
+            self.stream.write("\n")
+
+
+def read_ids(values):
+    """Expand "-" into instance ids read from stdin, one per line."""
+    ids = []
+    for value in values:
+        if value == "-":
+            ids.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            ids.append(value)
+    return ids
+
+
+def parse_spec(text):
+    """Parse "region plan os_id [count]" into a list of (region, plan, os_id)."""
+    parts = text.replace(",", " ").split()
+    if len(parts) not in (3, 4) or not parts[2].isdigit():
+        raise argparse.ArgumentTypeError(f"invalid spec {text!r}, expected 'region plan os_id [count]'")
+    count = int(parts[3]) if len(parts) == 4 else 1
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"invalid count in spec {text!r}")
+    return [(parts[0], parts[1], int(parts[2]))] * count
+
+
+def add_details(api, instances):
+    """Merge each instance's detail (e.g. its default password) into it, in place."""
+    by_id = {inst.get("id"): inst for inst in instances if inst.get("id")}
+    for instance_id, detail in api.get_instance_details(by_id):
+        if detail:
+            by_id[instance_id].update(detail)
+
+
+def cmd_list(api, args, out):
+    # Only the list pages decide the exit status: a failed detail lookup
+    # (e.g. an instance deleted meanwhile) keeps the list fields.
+    errors = []
+    instances = []
+    for page in api.iter_instance_pages(errors=errors):
+        if args.filter:
+            instances.extend(page)
+            continue
+        if not args.no_details:
+            add_details(api, page)
+        for inst in page:
+            out.emit(inst)
+
+    if args.filter:
+        # Index compact records; details are fetched only for the matches.
+        index = FleetIndex([InstanceRecord.from_api(inst) for inst in instances])
+        matches = [instances[position] for position in index.positions(args.filter)]
+        if not args.no_details:
+            add_details(api, matches)
+        for inst in matches:
+            out.emit(inst)
+    return EXIT_FAILURES if errors else EXIT_OK
+
+
+def emit_results(out, results):
+    failures = 0
+    for record in results:
+        failures += not record["ok"]
+        out.emit(record)
+    return EXIT_FAILURES if failures else EXIT_OK
+
+
+def cmd_create(api, args, out):
+    specs = [spec for group in args.spec for spec in group]
+    if args.region or args.plan or args.os:
+        if not (args.region and args.plan and args.os):
+            print("create: --region, --plan and --os must be given together", file=sys.stderr)
+            return EXIT_USAGE
+        specs.extend([(args.region, args.plan, args.os)] * args.count)
+    if not specs:
+        print("create: nothing to create; use --region/--plan/--os or --spec", file=sys.stderr)
+        return EXIT_USAGE
+
+    return emit_results(out, (
+        {
+            "index": index,
+            "region": specs[index][0],
+            "plan": specs[index][1],
+            "os_id": specs[index][2],
+            "ok": bool(instance),
+            "instance": instance
+        }
+        for index, instance in api.create_instances(specs)
+    ))
+
+
+def cmd_reinstall(api, args, out):
+    ids = read_ids(args.ids)
+    return emit_results(out, (
+        {"id": instance_id, "ok": ok}
+        for instance_id, ok in api.reinstall_instances(ids, args.os)
+    ))
+
+
+def cmd_delete(api, args, out):
+    ids = read_ids(args.ids)
+    if not args.yes:
+        print(f"delete: refusing to delete {len(ids)} instance(s) without --yes", file=sys.stderr)
+        return EXIT_USAGE
+    return emit_results(out, (
+        {"id": instance_id, "ok": ok}
+        for instance_id, ok in api.delete_instances(ids)
+    ))
+
+
+def cmd_catalog(api, args, out):
+    config_manager = ConfigManager(args.config)
+    cache = CatalogCache(config_manager.get_data_path("catalog_cache.json"), api.api_key)
+
+    if args.resource == "availability":
+        availability = None if args.refresh else cache.get("availability")
+        if availability is None or not cache.is_fresh("availability"):
+            regions = cache.get("regions")
+            if regions is None:
+                result = api.fetch_catalog("regions")
+                if result is None:
+                    # Nothing to ask availability for; an empty map must not be cached.
+                    return EXIT_FAILURES
+                regions = result[0]
+            availability = {
+                region_id: plan_ids
+                for region_id, plan_ids in api.get_regions_availability(
+                    [r["id"] for r in regions if r.get("id")]
+                )
+                if plan_ids is not None
+            }
+            cache.put("availability", availability)
+        for region_id, plan_ids in sorted(availability.items()):
+            out.emit({"region": region_id, "available_plans": plan_ids})
+        return EXIT_OK
+
+    items = cache.get(args.resource)
+    if args.refresh or items is None or not cache.is_fresh(args.resource):
+        result = api.fetch_catalog(args.resource, None if args.refresh else cache.validators(args.resource))
+        if result is None:
+            if items is None:
+                return EXIT_FAILURES
+        elif result[0] is None:
+            cache.touch(args.resource)
+        else:
+            items, validators = result
+            cache.put(args.resource, items, validators)
+    if args.resource == "plans":
+        max_cost = args.max_cost
+        if max_cost is None:
+            max_cost = config_manager.get_setting("plan_budget", MAX_PLAN_COST)
+        items = PlanTable(items).query(
+            max_cost=max_cost,
+            min_vcpu=args.min_vcpu,
+            max_vcpu=args.max_vcpu,
+            min_ram=args.min_ram,
+            max_ram=args.max_ram
+        )
+    for item in items:
+        out.emit(item)
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m vultr_cli", description="Headless Vultr panel.")
+    parser.add_argument("--api-key", help="API key (default: $VULTR_API_KEY, then config.json)")
+    parser.add_argument("--config", default="config.json", help="config file path")
+    parser.add_argument("--account", help="use this saved account's key (default: the active account)")
+    parser.add_argument("--format", choices=("ndjson", "json"), default="ndjson")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="max concurrent requests for bulk operations")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT,
+                        help="requests per second (0 disables the limiter)")
+    parser.add_argument("--metrics", choices=("json", "prometheus"),
+                        help="write per-endpoint request metrics to stderr on exit")
+    parser.add_argument("--record", metavar="FILE", default=os.environ.get("VULTR_RECORD"),
+                        help="append redacted request/response pairs to a JSONL file")
+    parser.add_argument("--replay", metavar="FILE", default=os.environ.get("VULTR_REPLAY"),
+                        help="serve responses from a recorded JSONL file instead of the network")
+    parser.add_argument("--replay-speed", type=float, default=0,
+                        help="emulate recorded latency at this speed (1 = as recorded; 0 = no delay)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list instances")
+    list_parser.add_argument("--filter", help="filter query, e.g. 'region:ewr status:active'")
+    list_parser.add_argument("--no-details", action="store_true",
+                             help="skip per-instance detail requests (no passwords)")
+    list_parser.set_defaults(handler=cmd_list)
+
+    create_parser = commands.add_parser("create", help="create instances")
+    create_parser.add_argument("--region")
+    create_parser.add_argument("--plan")
+    create_parser.add_argument("--os", type=int, help="OS id")
+    create_parser.add_argument("--count", type=int, default=1)
+    create_parser.add_argument("--spec", type=parse_spec, action="append", default=[],
+                               help="'region plan os_id [count]'; repeatable")
+    create_parser.set_defaults(handler=cmd_create)
+
+    reinstall_parser = commands.add_parser("reinstall", help="reinstall instances")
+    reinstall_parser.add_argument("ids", nargs="+", help="instance ids, or - to read from stdin")
+    reinstall_parser.add_argument("--os", type=int, help="OS id (default: keep current)")
+    reinstall_parser.set_defaults(handler=cmd_reinstall)
+
+    delete_parser = commands.add_parser("delete", help="delete instances")
+    delete_parser.add_argument("ids", nargs="+", help="instance ids, or - to read from stdin")
+    delete_parser.add_argument("--yes", action="store_true", help="confirm deletion")
+    delete_parser.set_defaults(handler=cmd_delete)
+
+    catalog_parser = commands.add_parser("catalog", help="show regions, plans, OS images or availability")
+    catalog_parser.add_argument("resource", choices=CATALOG_RESOURCES + ("availability",))
+    catalog_parser.add_argument("--refresh", action="store_true", help="bypass the catalog cache")
+    catalog_parser.add_argument("--max-cost", type=float,
+                                help="plans: monthly budget in USD (default: the panel's budget setting)")
+    catalog_parser.add_argument("--min-vcpu", type=int, help="plans: minimum vCPUs")
+    catalog_parser.add_argument("--max-vcpu", type=int, help="plans: maximum vCPUs")
+    catalog_parser.add_argument("--min-ram", type=int, help="plans: minimum RAM in MB")
+    catalog_parser.add_argument("--max-ram", type=int, help="plans: maximum RAM in MB")
+    catalog_parser.set_defaults(handler=cmd_catalog)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.account:
+        api_key = ConfigManager(args.config).get_api_key(args.account)
+        if not api_key:
+            print(f"No saved account named {args.account!r} in {args.config}", file=sys.stderr)
+            return EXIT_USAGE
+    else:
+        api_key = args.api_key or os.environ.get("VULTR_API_KEY") or ConfigManager(args.config).get_api_key()
+    if not api_key and args.replay:
+        api_key = "replay"
+    if not api_key:
+        print("No API key: pass --api-key, set VULTR_API_KEY or save one in config.json", file=sys.stderr)
+        return EXIT_USAGE
+
+    api = VultrAPI(
+        api_key,
+        max_workers=args.concurrency,
+        rate_limit=args.rate_limit,
+        recorder=TrafficRecorder(args.record) if args.record else None,
+        transport=ReplayTransport(args.replay, args.replay_speed or None) if args.replay else None
+    )
+    out = Output(args.format)
+    try:
+        return args.handler(api, args, out)
+    finally:
+        out.close()
+        if args.metrics:
+            sys.stderr.write(api.metrics.export(args.metrics))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Request building and response parsing shared by VultrAPI and AsyncVultrAPI.
+
+Parsers take any response object exposing ``status_code``, ``headers``,
+``text`` and ``json()`` (or None for a failed request), so both clients
+interpret the API identically.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from plan_table import PlanTable
+
+API_BASE_URL = "https://api.vultr.com/v2"
+DEFAULT_CONCURRENCY = 8
+# Pooled connections beyond the fan-out width, for the poller and one-off
+# calls that run alongside a refresh.
+POOL_HEADROOM = 2
+# (connect, read) seconds per kind of operation; see operation_kind().
+DEFAULT_TIMEOUTS = {
+    "get": (5, 10),
+    # Pages of up to 500 items can take a while to render server-side.
+    "list": (5, 30),
+    # Create, reinstall and delete.
+    "write": (5, 30),
+}
+DEFAULT_PAGE_SIZE = 100
+MAX_PLAN_COST = 5.0
+
+# Vultr allows 30 requests/second per key; stay a little under it by default.
+DEFAULT_RATE_LIMIT = 20
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_AFTER_CAP = 30.0
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# POSTs (create, reinstall) are never retried: a repeat could act twice.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RateLimiter:
+    """Token bucket shared by every request made through one client.
+
+    reserve() takes a token and returns how many seconds the caller must
+    wait before using it, so sync and async clients can sleep their own way.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+def make_rate_limiter(rate_limit):
+    return RateLimiter(rate_limit) if rate_limit else None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and receive the same result. The key is released as
+    soon as the call finishes, so later callers always get fresh data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """Return (result, shared); shared is True if another caller's result was reused."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None}
+
+        if not leader:
+            call["done"].wait()
+            return call["result"], True
+
+        try:
+            call["result"] = func()
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+        return call["result"], False
+
+
+def flight_key(method, path, kwargs):
+    """Identify a request for coalescing: method, path, query and headers."""
+    return f"{method.upper()} {path} {json.dumps(kwargs, sort_keys=True, default=str)}"
+
+
+def operation_kind(method, kwargs):
+    """Classify a request as "get", "list" (a paged GET) or "write" for its timeouts."""
+    if method.upper() != "GET":
+        return "write"
+    return "list" if "per_page" in (kwargs.get("params") or {}) else "get"
+
+
+def default_pool_size(max_workers):
+    return max(1, max_workers) + POOL_HEADROOM
+
+
+def should_retry(method, status_code, attempt, max_retries=MAX_RETRIES):
+    return (
+        attempt < max_retries
+        and method.upper() in IDEMPOTENT_METHODS
+        and status_code in RETRY_STATUSES
+    )
+
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt + 1 (full-jitter backoff)."""
+    delay = parse_retry_after(retry_after)
+    if delay is None:
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    return min(delay, RETRY_AFTER_CAP)
+
+
+def request_error(status_code, message):
+    """Describe a failed request; status_code is None for network errors."""
+    return {"status": status_code, "message": message}
+
+
+class ApiResponse:
+    """Minimal response for clients whose HTTP stack has no requests.Response.
+
+    headers should look up names case-insensitively, as requests' do.
+    """
+
+    def __init__(self, status_code, headers=None, content=b""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+
+    def __bool__(self):
+        # Mirror requests.Response, which is falsy for 4xx/5xx statuses.
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def auth_headers(api_key, compress=True):
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        # Instance and catalog pages are repetitive JSON and shrink ~10x gzipped.
+        "Accept-Encoding": "gzip" if compress else "identity"
+    }
+
+
+def parse_cost(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Fields kept from each catalog entry; the rest of the payload is dropped as pages arrive.
+PLAN_FIELDS = ("id", "vcpu_count", "ram", "disk", "bandwidth", "type")
+OS_FIELDS = ("id", "name", "arch", "family")
+
+
+def compact_plan(plan):
+    """Return the fields the panel uses with monthly_cost parsed once, or None to drop the plan."""
+    cost = parse_cost(plan.get("monthly_cost"))
+    if cost is None or not plan.get("id"):
+        return None
+    compact = {field: plan[field] for field in PLAN_FIELDS if field in plan}
+    compact["monthly_cost"] = cost
+    return compact
+
+
+def compact_os(item):
+    if item.get("id") is None:
+        return None
+    return {field: item[field] for field in OS_FIELDS if field in item}
+
+
+def compact_items(items, parse_item):
+    """Apply a per-item parser, dropping entries it rejects."""
+    if parse_item is None:
+        return list(items)
+    parsed = []
+    for item in items:
+        item = parse_item(item)
+        if item is not None:
+            parsed.append(item)
+    return parsed
+
+
+def sort_plans(plans):
+    """Sort compact plans by cost, then id."""
+    return PlanTable(plans).plans
+
+
+def filter_affordable_plans(plans, max_cost=MAX_PLAN_COST):
+    """Keep compact plans costing at most max_cost per month, cheapest first."""
+    return PlanTable(plans).query(max_cost=max_cost)
+
+
+def sort_regions(regions):
+    """Sort regions by city, then id."""
+    return sorted(regions, key=lambda r: (r.get("city", ""), r.get("id", "")))
+
+
+# Catalog resource -> parser applied to each item as its page arrives.
+CATALOG_ITEM_PARSERS = {
+    "plans": compact_plan,
+    "os": compact_os,
+}
+
+# Catalog resource -> post-processing applied to the parsed list. Plans are
+# cached unfiltered so the budget can change without refetching.
+CATALOG_PARSERS = {
+    "regions": sort_regions,
+    "plans": sort_plans,
+    "os": list,
+}
+
+
+def instance_payload(region, plan, os_id):
+    return {
+        "region": region,
+        "plan": plan,
+        "os_id": os_id,
+        "enable_ipv6": False,
+        "backups": "disabled",
+        "ddos_protection": False,
+        "activation_email": False
+    }
+
+
+def reinstall_payload(os_id):
+    return {"os_id": os_id} if os_id else None
+
+
+def conditional_headers(validators):
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response):
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    return validators
+
+
+def parse_page(response, key):
+    """Return (items, next_cursor) for a list response, or None on failure."""
+    if not response or response.status_code != 200:
+        return None
+    payload = response.json()
+    cursor = (payload.get("meta") or {}).get("links", {}).get("next")
+    return payload.get(key, []), cursor
+
+
+def parse_instance(response, expected_status=200):
+    if response and response.status_code == expected_status:
+        return response.json().get("instance", {})
+    return None
+
+
+def parse_availability(response):
+    """Return the plan ids deployable in a region, or None on failure."""
+    if not response or response.status_code != 200:
+        return None
+    return response.json().get("available_plans", [])
+
+
+def parse_reinstall(response):
+    if not response:
+        return False
+
+    if response.status_code != 204:
+        print(f"Reinstall status: {response.status_code}", file=sys.stderr)
+        print(f"Reinstall response: {response.text}", file=sys.stderr)
+    return response.status_code == 204
+
+
+def parse_no_content(response):
+    return bool(response and response.status_code == 204)
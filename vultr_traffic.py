@@ -0,0 +1,169 @@
+"""Record and replay Vultr API traffic as JSONL.
+
+TrafficRecorder appends one line per HTTP exchange (retried attempts
+included) with secrets redacted: request headers are never written, and
+passwords, keys and user_data are masked in bodies. ReplayTransport serves
+those responses back offline, in recorded order per method + path + query,
+optionally sleeping for the recorded latency.
+
+Both clients pick these up from the environment (see traffic_from_env):
+
+    VULTR_RECORD=traffic.jsonl python main.py
+    VULTR_REPLAY=traffic.jsonl VULTR_REPLAY_SPEED=1 python main.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from vultr_common import ApiResponse
+
+REDACTED = "***"
+SECRET_KEYS = frozenset({"default_password", "password", "root_pass", "api_key", "token", "user_data"})
+# Only these response headers are recorded; the rest may carry cookies or account ids.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+def redact(value):
+    """Return value with secret fields masked, recursively."""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k.lower() in SECRET_KEYS and v else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def exchange_key(method, url, params=None):
+    """Identify a request by method, URL path and sorted query, ignoring the host."""
+    parts = urlsplit(url)
+    query = sorted(
+        [(str(k), str(v)) for k, v in (params or {}).items()] + parse_qsl(parts.query)
+    )
+    path = parts.path
+    if query:
+        path += "?" + urlencode(query)
+    return f"{method.upper()} {path}"
+
+
+def response_headers(response):
+    headers = {name.lower(): value for name, value in response.headers.items()}
+    return {name: headers[name.lower()] for name in RECORDED_HEADERS if name.lower() in headers}
+
+
+def response_body(response):
+    try:
+        return redact(response.json()), None
+    except ValueError:
+        return None, response.text
+
+
+class TrafficRecorder:
+    """Appends redacted request/response pairs to a JSONL file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, method, url, params, payload, response, elapsed):
+        body, text = response_body(response)
+        entry = {
+            "key": exchange_key(method, url, params),
+            "method": method.upper(),
+            "request": redact(payload) if payload is not None else None,
+            "status": response.status_code,
+            "headers": response_headers(response),
+            "body": body,
+            "elapsed": round(elapsed, 6),
+            "time": round(time.time(), 3),
+        }
+        if text:
+            entry["text"] = text
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"Error recording traffic: {e}", file=sys.stderr)
+
+
+class ReplayTransport:
+    """Serves recorded responses in place of the network.
+
+    Responses for one key are returned in recorded order; once exhausted,
+    the last one repeats. Unrecorded requests get a 404. With speed set,
+    each response is delayed by its recorded latency divided by speed.
+    """
+
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._exchanges = self.load()
+
+    def load(self):
+        exchanges = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    exchanges.setdefault(entry.get("key"), deque()).append(entry)
+        except OSError as e:
+            print(f"Error loading traffic: {e}", file=sys.stderr)
+        return exchanges
+
+    def lookup(self, method, url, params=None):
+        """Return (response, recorded latency) for a request."""
+        key = exchange_key(method, url, params)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if not queue:
+                print(f"No recorded response for {key}", file=sys.stderr)
+                return ApiResponse(404, {}, b'{"error": "not recorded"}'), 0.0
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if entry.get("body") is not None:
+            content = json.dumps(entry["body"]).encode("utf-8")
+        else:
+            content = (entry.get("text") or "").encode("utf-8")
+        return ApiResponse(entry["status"], dict(entry.get("headers") or {}), content), entry.get("elapsed", 0.0)
+
+    def delay(self, elapsed):
+        """Seconds to wait before serving a response recorded as taking elapsed seconds."""
+        return elapsed / self.speed if self.speed else 0.0
+
+    def request(self, method, url, params=None, **kwargs):
+        """requests.Session-compatible entry point for VultrAPI."""
+        response, elapsed = self.lookup(method, url, params)
+        wait = self.delay(elapsed)
+        if wait:
+            time.sleep(wait)
+        return response
+
+
+def traffic_from_env(environ=None):
+    """Return (recorder, replay transport) configured by VULTR_RECORD / VULTR_REPLAY.
+
+    VULTR_REPLAY_SPEED enables timing emulation (1 = recorded speed, 2 = twice as fast).
+    """
+    environ = os.environ if environ is None else environ
+    recorder = TrafficRecorder(environ["VULTR_RECORD"]) if environ.get("VULTR_RECORD") else None
+    transport = None
+    if environ.get("VULTR_REPLAY"):
+        try:
+            speed = float(environ.get("VULTR_REPLAY_SPEED") or 0) or None
+        except ValueError:
+            speed = None
+        transport = ReplayTransport(environ["VULTR_REPLAY"], speed)
+    return recorder, transport